@@ -0,0 +1,50 @@
+"""Timeout and failure paths."""
+import time
+
+import pytest
+
+import parallel
+
+ITEMS = 200
+
+
+def fail(value):
+    raise ValueError(value)
+
+
+def sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+@pytest.mark.benchmark(group="failures")
+def test_silent_failures(benchmark):
+    results = benchmark(parallel.map, fail, range(ITEMS), silent=True)
+    assert len(results.failed) == ITEMS
+
+
+@pytest.mark.benchmark(group="failures")
+def test_fail_fast(benchmark):
+    def run():
+        with pytest.raises(ValueError):
+            parallel.map(fail, range(ITEMS))
+
+    benchmark(run)
+
+
+@pytest.mark.benchmark(group="failures")
+def test_retries(benchmark):
+    results = benchmark(parallel.map, fail, range(ITEMS), silent=True, retries=2)
+    assert results.failed[0].attempts == 3
+
+
+@pytest.mark.benchmark(group="timeouts")
+def test_deadline(benchmark):
+    # Half the jobs are reported as timed out
+    params = [0, 1] * 4
+
+    def run():
+        return parallel.map(sleep, params, deadline=.05, silent=True, max_workers=8)
+
+    results = benchmark.pedantic(run, rounds=5)
+    assert len(results.failed) == 4
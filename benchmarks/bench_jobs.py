@@ -0,0 +1,45 @@
+"""Allocation and time per job of the `map` bookkeeping.
+
+    python benchmarks/bench_jobs.py [items]
+"""
+import sys
+import time
+import tracemalloc
+
+import parallel
+from parallel.models import ParallelJob
+
+
+def identity(value, scale=1):
+    return value
+
+
+def measure(label, items, fn):
+    # Timed without tracemalloc, which slows down allocations
+    started = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    retained = fn()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print("{:<28} {:>8.2f} us/job {:>8.0f} B/job retained {:>8.0f} B/job peak".format(
+        label, elapsed / items * 1e6, current / items, peak / items))
+    return retained
+
+
+def main(items=10 ** 6):
+    params = range(items)
+    extras = {"scale": 2}
+    measure("build jobs", items, lambda: ParallelJob.build_for_callable_from_params(
+        identity, params))
+    measure("build jobs (extras)", items, lambda: ParallelJob.build_for_callable_from_params(
+        identity, params, extras=extras))
+    # Chunks amortize the executor's per call overhead, what's left is the
+    # per job bookkeeping
+    measure("map (threads, chunks)", items, lambda: parallel.map(
+        identity, params, extras=extras, chunksize=10 ** 4, max_workers=4))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
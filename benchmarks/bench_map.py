@@ -0,0 +1,49 @@
+"""Per item overhead of `parallel.map` against bare `concurrent.futures`."""
+import concurrent.futures as cf
+
+import pytest
+
+import parallel
+
+from conftest import noop
+
+ITEMS = 2000
+WORKERS = 4
+
+
+@pytest.mark.benchmark(group="map-overhead")
+def test_bare_thread_pool_executor(benchmark):
+    def run():
+        with cf.ThreadPoolExecutor(max_workers=WORKERS) as executor:
+            return list(executor.map(noop, range(ITEMS)))
+
+    assert benchmark(run) == list(range(ITEMS))
+
+
+@pytest.mark.benchmark(group="map-overhead")
+def test_map(benchmark):
+    results = benchmark(parallel.map, noop, range(ITEMS), max_workers=WORKERS)
+    assert results == list(range(ITEMS))
+
+
+@pytest.mark.benchmark(group="map-overhead")
+def test_map_chunks(benchmark):
+    results = benchmark(
+        parallel.map, noop, range(ITEMS), max_workers=WORKERS, chunksize="auto")
+    assert results == list(range(ITEMS))
+
+
+@pytest.mark.benchmark(group="map-overhead")
+def test_pool_map(benchmark):
+    # Without the cost of creating (and shutting down) the threads
+    with parallel.Pool(max_workers=WORKERS) as pool:
+        results = benchmark(pool.map, noop, range(ITEMS))
+    assert results == list(range(ITEMS))
+
+
+@pytest.mark.benchmark(group="map-overhead")
+def test_imap(benchmark):
+    def run():
+        return list(parallel.imap(noop, range(ITEMS), max_workers=WORKERS))
+
+    assert len(benchmark(run)) == ITEMS
@@ -0,0 +1,32 @@
+"""Startup cost of process workers."""
+import concurrent.futures as cf
+
+import pytest
+
+import parallel
+
+from conftest import noop, WORKER_COUNTS
+
+
+@pytest.mark.benchmark(group="process-startup")
+@pytest.mark.parametrize("workers", WORKER_COUNTS)
+def test_bare_process_pool_executor(benchmark, workers):
+    def run():
+        with cf.ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(noop, range(workers)))
+
+    benchmark.pedantic(run, rounds=5)
+
+
+@pytest.mark.benchmark(group="process-startup")
+@pytest.mark.parametrize("workers", WORKER_COUNTS)
+def test_process_map(benchmark, workers):
+    benchmark.pedantic(
+        parallel.process.map, (noop, range(workers)), {"max_workers": workers}, rounds=5)
+
+
+@pytest.mark.benchmark(group="process-startup")
+def test_process_pool_reused(benchmark):
+    with parallel.Pool(parallel.PROCESS_EXECUTOR, max_workers=2) as pool:
+        pool.map(noop, range(2))
+        benchmark.pedantic(pool.map, (noop, range(2)), rounds=5)
@@ -0,0 +1,30 @@
+"""Construction of the result containers."""
+import pytest
+
+from parallel.models import SequentialMapResult, NamedMapResult
+
+ITEMS = 100000
+
+
+def build(ResultClass, names):
+    results = ResultClass()
+    for name in names:
+        results.new_result(name, name)
+    return results
+
+
+@pytest.mark.benchmark(group="results")
+def test_sequential_results(benchmark):
+    assert len(benchmark(build, SequentialMapResult, [None] * ITEMS)) == ITEMS
+
+
+@pytest.mark.benchmark(group="results")
+def test_named_results(benchmark):
+    names = ["job-{}".format(i) for i in range(ITEMS)]
+    assert len(benchmark(build, NamedMapResult, names)) == ITEMS
+
+
+@pytest.mark.benchmark(group="results")
+def test_failed_lookup(benchmark):
+    results = build(SequentialMapResult, [None] * ITEMS)
+    benchmark(lambda: (results.failures, results.failed))
@@ -0,0 +1,52 @@
+"""Serialization of large arguments sent to process workers."""
+import pytest
+
+import parallel
+
+SIZE = 16 * 2 ** 20
+JOBS = 8
+
+
+def length(data, index=0):
+    return len(data) + index
+
+
+def length_of_extra(index, data):
+    return len(data) + index
+
+
+@pytest.mark.benchmark(group="large-arguments")
+def test_argument_per_job(benchmark):
+    # The payload is pickled with every job
+    data = b"x" * SIZE
+    benchmark.pedantic(
+        parallel.process.map, (length, [(data, i) for i in range(JOBS)]),
+        {"max_workers": 2}, rounds=3)
+
+
+@pytest.mark.benchmark(group="large-arguments")
+def test_extras(benchmark):
+    # Registered once per worker process
+    data = b"x" * SIZE
+    benchmark.pedantic(
+        parallel.process.map, (length_of_extra, range(JOBS)),
+        {"max_workers": 2, "extras": {"data": data}}, rounds=3)
+
+
+@pytest.mark.benchmark(group="large-arguments")
+def test_split_shared_memory(benchmark):
+    np = pytest.importorskip("numpy")
+    array = np.ones(SIZE // 8)
+    benchmark.pedantic(
+        parallel.split, (array, np.sqrt),
+        {"executor": parallel.PROCESS_EXECUTOR, "workers": 2, "transport": "shared_memory"},
+        rounds=3)
+
+
+@pytest.mark.benchmark(group="large-arguments")
+def test_split_pickled(benchmark):
+    np = pytest.importorskip("numpy")
+    array = np.ones(SIZE // 8)
+    benchmark.pedantic(
+        parallel.split, (array, np.sqrt),
+        {"executor": parallel.PROCESS_EXECUTOR, "workers": 2}, rounds=3)
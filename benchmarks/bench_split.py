@@ -0,0 +1,34 @@
+"""`split` scaling, from 1 to all the cores."""
+import pytest
+
+import parallel
+
+from conftest import busy, WORKER_COUNTS
+
+# Each item is a (small) CPU bound task
+RECORDS = [20000] * 200
+
+
+def process_records(records):
+    return [busy(record) for record in records]
+
+
+@pytest.mark.benchmark(group="split-scaling")
+@pytest.mark.parametrize("workers", WORKER_COUNTS)
+def test_split_processes(benchmark, workers):
+    results = benchmark.pedantic(
+        parallel.split,
+        (RECORDS, process_records),
+        {"executor": parallel.PROCESS_EXECUTOR, "workers": workers},
+        rounds=3,
+    )
+    assert len(results) == len(RECORDS)
+
+
+@pytest.mark.benchmark(group="split-scaling")
+@pytest.mark.parametrize("workers", WORKER_COUNTS)
+def test_split_threads(benchmark, workers):
+    # The GIL is held: threads shouldn't scale
+    results = benchmark.pedantic(
+        parallel.split, (RECORDS, process_records), {"workers": workers}, rounds=3)
+    assert len(results) == len(RECORDS)
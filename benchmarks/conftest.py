@@ -0,0 +1,18 @@
+import os
+
+# Powers of two up to the number of cores (plus all of them)
+WORKER_COUNTS = sorted(
+    {2 ** i for i in range(8) if 2 ** i <= (os.cpu_count() or 1)} | {os.cpu_count() or 1}
+)
+
+
+def noop(value):
+    return value
+
+
+def busy(iterations):
+    # CPU bound work (holds the GIL)
+    total = 0
+    for i in range(iterations):
+        total += i * i
+    return total
@@ -1,5 +1,13 @@
 import os
+import sys
 import enum
+import time
+import uuid
+import heapq
+import queue
+import atexit
+import weakref
+import threading
 
 import functools
 import itertools
@@ -7,20 +15,41 @@ import collections
 import concurrent.futures as cf
 
 from . import errors
+from . import aio
+from . import shm
+from . import stats
+from . import cache as _cache
+from .progress import Progress
+from .checkpoint import Checkpoint
+from .dag import Graph
+from .profiling import ProfileReport
 from . import utils
+from . import worker
 from . import exceptions
+from . import sinks
+from . import dag
+from .hooks import Hooks, HookList
+from .worker import cancelled
+from .utils import set_concurrency_budget
 from .models import (
+    CancellationToken,
     ParallelJob,
     ParallelArg,
     ParallelStatus,
     FailedTask,
     SequentialMapResult,
     NamedMapResult,
+    ColumnarMapResult,
+    SinkResult,
+    _SharedKwargs,
 )
 
 
 # __all__ = ["decorate", "arg", "future", "map", "async_map", "par", "async_par"]
-__all__ = ["map", "async_map", "par", "async_par"]
+__all__ = [
+    "map", "async_map", "imap", "par", "async_par", "amap", "apar", "Pool",
+    "cancelled", "Hooks", "set_concurrency_budget",
+]
 
 __version__ = "0.9.1"
 __author__ = "Santiago Basulto <santiago.basulto@gmail.com>"
@@ -29,13 +58,30 @@ __author__ = "Santiago Basulto <santiago.basulto@gmail.com>"
 class ExecutorStrategy(enum.Enum):
     THREAD_EXECUTOR = "thread"
     PROCESS_EXECUTOR = "process"
+    ASYNCIO_EXECUTOR = "asyncio"
 
 
 THREAD_EXECUTOR = ExecutorStrategy.THREAD_EXECUTOR
 PROCESS_EXECUTOR = ExecutorStrategy.PROCESS_EXECUTOR
+ASYNCIO_EXECUTOR = ExecutorStrategy.ASYNCIO_EXECUTOR
+
+
+class Scheduler(enum.Enum):
+    FIFO = "fifo"
+    GUIDED = "guided"
+
+
+FIFO_SCHEDULER = Scheduler.FIFO
+GUIDED_SCHEDULER = Scheduler.GUIDED
 
 
 class BaseParallelExecutor:
+    # Calls are wrapped by `_runner`, which reports timings along with the
+    # outcome, when they're needed (stats, hooks or profiles); by `_run`
+    # otherwise
+    _runner = staticmethod(worker.timed)
+    _run = staticmethod(worker.run)
+
     def __init__(
         self,
         jobs,
@@ -43,19 +89,123 @@ class BaseParallelExecutor:
         timeout=None,
         silent=False,
         ResultClass=SequentialMapResult,
+        pool=None,
+        max_in_flight=None,
+        chunksize=1,
+        fn=None,
+        extras=None,
+        deadline=None,
+        retries=0,
+        backoff=0,
+        retry_on=(Exception,),
+        scheduler=Scheduler.FIFO,
+        cost=None,
+        hooks=None,
+        progress=None,
+        cache=None,
+        dedupe=False,
+        profile=None,
+        sink=None,
+        checkpoint=None,
+        stats=False,
     ):
         self.jobs = jobs
+        if max_workers is None:
+            # Nested in a job: limited to its share of the budget
+            max_workers = worker.budget()
         self.max_workers = max_workers
         self.timeout = timeout
         self.silent = silent
         self.ResultClass = ResultClass
+        self.pool = pool
+        self.max_in_flight = max_in_flight
+        self.chunksize = chunksize
+        # When all the jobs share the same callable (`map`), executors can
+        # ship `fn` and `extras` to workers only once
+        self.fn = fn
+        self.extras = extras or {}
+        # `timeout` bounds each wait, `deadline` the whole batch (wall time)
+        self.deadline = deadline
+        self.__expires_at = None
+        self.__cancelled = False
+        self.cancel_token = CancellationToken()
+        # Failed jobs are resubmitted (up to `retries` times) after a delay
+        self.retries = retries
+        self.backoff = backoff
+        self.retry_on = retry_on
+        self.__retrying = []
+        self.__reordering = {}
+        # With the guided scheduler chunks shrink as the remaining jobs
+        # decrease; `cost(job)` sorts the jobs (most expensive first)
+        self.scheduler = Scheduler(scheduler)
+        self.cost = cost
+        self.__remaining = None
+        # `None` unless hooks are given, so the hot path only checks that
+        if isinstance(hooks, (list, tuple)):
+            hooks = HookList(hooks)
+        self.hooks = hooks
+        # `progress=True` prints to stderr, a callable receives the reports
+        if progress and not isinstance(progress, Progress):
+            progress = Progress(None if progress is True else progress)
+        self.progress = progress or None
+        # Cached jobs aren't submitted, neither are the copies of a job
+        # that's already running (they're resolved with its outcome)
+        self.cache = cache
+        self.dedupe = dedupe or cache is not None
+        self.__ready = collections.deque()
+        self.__keys = {}
+        self.__followers = {}
+        self.__resolved = {}
+        # `profile=True` (or a `ProfileReport` to add the stats to)
+        if profile is True:
+            profile = ProfileReport()
+        self.profile = profile or None
+        self.__done_at = {}
+        # Results are written to the sink as they complete; the in-flight
+        # window keeps a slow sink from piling them up in memory
+        self.sink = sinks.get_sink(sink)
+        if self.sink is not None and not self.max_in_flight:
+            workers = max_workers or getattr(pool, "max_workers", None)
+            self.max_in_flight = 2 * (workers or utils.default_max_workers())
+        # Jobs completed in a previous run are skipped, new results are
+        # appended to the checkpoint
+        if checkpoint is not None and not isinstance(checkpoint, Checkpoint):
+            checkpoint = Checkpoint(checkpoint)
+        self.checkpoint = checkpoint
+        # Workers of the parallel calls nested in each job
+        self._budget = None
+        self._timed = bool(stats or self.hooks is not None or self.profile is not None)
+        # Records of the jobs (for `stats`), not kept with a sink
+        self.__records = [] if self._timed and self.sink is None else None
+        self.__started_at = None
+        self.__finished_at = None
         self.__status = ParallelStatus.NOT_STARTED
         self.__executor = None
         self.__results = None
-
-    def _get_executor_class(self):  # pragma: no cover
+        self.__pending = None
+        self.__refill = False
+        self.__in_flight = {}
+        # Futures are put here when they finish (C implemented on 3.7+)
+        self.__done = getattr(queue, "SimpleQueue", queue.Queue)()
+
+    @classmethod
+    def _get_executor_class(cls):  # pragma: no cover
         raise NotImplementedError()
 
+    @classmethod
+    def _default_max_workers(cls):
+        return utils.default_max_workers()
+
+    @classmethod
+    def _new_executor(cls, max_workers, budget):
+        return cls._get_executor_class()(max_workers=max_workers)
+
+    def _workers(self):
+        workers = self.max_workers
+        if self.pool is not None:
+            workers = workers or self.pool.max_workers
+        return workers or self._default_max_workers()
+
     @property
     def status(self):
         return self.__status
@@ -64,13 +214,439 @@ class BaseParallelExecutor:
         if self.__status == ParallelStatus.STARTED:
             raise exceptions.ParallelStatusException(errors.STATUS_EXECUTOR_RUNNING)
         self.__status = ParallelStatus.STARTED
-
-        ExecutorClass = self._get_executor_class()
-        self.__executor = ExecutorClass(max_workers=self.max_workers)
-        for job in self.jobs:
-            future = self.__executor.submit(job.fn, *job.args, **(job.kwargs))
-            # TODO: Check status for ParallelJob
+        self.__started_at = time.time()
+        if self.deadline is not None:
+            self.__expires_at = time.monotonic() + self.deadline
+        if self.hooks is not None:
+            self.hooks.on_batch_start(self)
+        if self.checkpoint is not None:
+            self.checkpoint.open()
+
+        self._budget = utils.nested_budget(self._workers())
+        if self.pool is not None:
+            self.__executor = self.pool.get_executor()
+        else:
+            self.__executor = self._create_executor()
+        if isinstance(self.jobs, dag.Graph):
+            # Jobs are pulled from the graph as their dependencies resolve
+            self.__pending = self.jobs
+        else:
+            self.__pending = enumerate(self.jobs)
+        # Without a window (or a graph) every job is submitted right away,
+        # there's nothing to refill as they complete
+        self.__refill = bool(self.max_in_flight) or self.__pending is self.jobs
+        if self.cost is not None and self.__pending is not self.jobs:
+            # Longest processing time first, to minimize the makespan
+            self.__pending = iter(
+                sorted(self.__pending, key=lambda item: self.cost(item[1]), reverse=True)
+            )
+        if isinstance(self.jobs, collections.abc.Sized):
+            self.__remaining = len(self.jobs)
+        if self.progress is not None:
+            self.progress.start(total=self.__remaining)
+        self._submit_pending()
+
+    def _create_executor(self):
+        return self._new_executor(self.max_workers, self._budget)
+
+    def _build_call(self, batch):
+        if len(batch) == 1:
+            _, job = batch[0]
+            return job.fn, job.args, job.kwargs
+        # A whole chunk travels in a single call (and a single IPC message
+        # for processes), outcomes are unpacked per job later
+        items = [(job.args, job.kwargs) for _, job in batch]
+        return worker.run_chunk, (batch[0][1].fn, items), {}
+
+    def _submit(self, batch):
+        fn, args, kwargs = self._build_call(batch)
+        if self._timed:
+            future = self._submit_timed(batch, fn, args, kwargs)
+        else:
+            future = self.__executor.submit(self._run, fn, args, kwargs, self._budget)
+            for _, job in batch:
+                job.status = ParallelStatus.STARTED
+                job.future = future
+        self.__in_flight[future] = batch
+        if self.progress is not None:
+            # Registered first: it runs before the job is resolved (and
+            # maybe retried) by the consumer
+            future.add_done_callback(functools.partial(self._track_progress, batch))
+        if self.profile is not None:
+            future.add_done_callback(self._stamp_done)
+        future.add_done_callback(self.__done.put)
+
+    def _submit_timed(self, batch, fn, args, kwargs):
+        submitted_at = time.time()
+        context = None
+        if self.hooks is not None:
+            for _, job in batch:
+                job.submitted_at = submitted_at
+                self.hooks.on_submit(job)
+            context = self.hooks.propagate([job for _, job in batch])
+        profile = self.profile is not None
+        future = self.__executor.submit(
+            self._runner, fn, args, kwargs, context, profile, self._budget
+        )
+        for _, job in batch:
+            job.status = ParallelStatus.STARTED
             job.future = future
+            job.submitted_at = submitted_at
+        return future
+
+    def _stamp_done(self, future):
+        # When the result got back (to measure its serialization)
+        self.__done_at[future] = time.time()
+
+    def _track_progress(self, batch, future):
+        if future.cancelled():
+            return
+        try:
+            value = future.result()
+        except Exception as exc:
+            succeeded, result = False, exc
+        else:
+            succeeded, result = value[:2] if self._timed else (True, value)
+        completed = failed = 0
+        for (_, job), outcome in zip(batch, self._unpack(succeeded, result, len(batch))):
+            if self._should_retry(job, outcome):
+                continue
+            completed += 1
+            failed += not outcome[0]
+        if completed:
+            self.progress.update(completed, failed)
+
+    def _submit_pending(self):
+        # Only `max_in_flight` futures are kept pending, the rest of the jobs
+        # are pulled lazily (they might come from a generator) as others finish
+        available = None
+        if self.max_in_flight:
+            outstanding = (
+                len(self.__in_flight)
+                + len(self.__retrying)
+                + len(self.__ready)
+            )
+            if self.cost is None:
+                # Jobs sorted by cost complete out of order, the ones held
+                # for ordered results would fill the window (before the
+                # next one in order was even submitted)
+                outstanding += len(self.__reordering)
+            available = max(self.max_in_flight - outstanding, 0)
+        while available is None or available > 0:
+            batch = list(itertools.islice(self.__pending, self._next_chunksize()))
+            if not batch:
+                break
+            if self.__remaining is not None:
+                self.__remaining -= len(batch)
+            if self.dedupe or self.checkpoint is not None:
+                size = len(batch)
+                batch = [(index, job) for index, job in batch if not self._skip(index, job)]
+                if available is not None:
+                    available -= size - len(batch)
+                if not batch:
+                    continue
+            groups = [batch]
+            if len(batch) > 1 and self.fn is None:
+                groups = [
+                    list(group)
+                    for _, group in itertools.groupby(batch, key=lambda item: item[1].fn)
+                ]
+            for group in groups:
+                self._submit(group)
+                if available is not None:
+                    available -= 1
+
+    def _skip(self, index, job):
+        if self.checkpoint is not None and self._restore(index, job):
+            return True
+        return self.dedupe and self._lookup(index, job)
+
+    def _restore(self, index, job):
+        """`True` if the job completed in a previous run (its result is in
+        the checkpoint)."""
+        result = self.checkpoint.get(self._job_key(index, job))
+        if result is _cache.MISSING:
+            return False
+        self.__ready.append((index, job, (True, result)))
+        if self.progress is not None:
+            self.progress.update(1)
+        return True
+
+    def _lookup(self, index, job):
+        """`True` if the job's outcome is (or will be) known without running
+        it: it's cached or a copy of it is already running."""
+        if self.cache is not None and not isinstance(self.cache, _cache.MemoryCache):
+            # Persistent caches need keys that are stable across processes
+            key = _cache.job_digest(job)
+        else:
+            key = _cache.job_key(job)
+        if key is None:
+            return False
+        if key in self.__followers:
+            self.__followers[key].append((index, job))
+            return True
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            outcome = None if cached is _cache.MISSING else (True, cached)
+        else:
+            outcome = self.__resolved.get(key)
+        if outcome is not None:
+            self.__ready.append((index, job, outcome))
+            if self.progress is not None:
+                self.progress.update(1, 0 if outcome[0] else 1)
+            return True
+        self.__keys[id(job)] = key
+        self.__followers[key] = []
+        return False
+
+    def _fan_out(self, job, outcome):
+        # Store the outcome of the job and resolve its copies with it
+        key = self.__keys.pop(id(job), None)
+        if key is None:
+            return
+        succeeded, result = outcome
+        if self.cache is None:
+            # Copies that show up later (ie: from a generator) aren't run again
+            self.__resolved[key] = outcome
+        elif succeeded:
+            self.cache.set(key, result)
+        followers = self.__followers.pop(key)
+        if followers and self.progress is not None:
+            self.progress.update(len(followers), 0 if succeeded else len(followers))
+        for index, follower in followers:
+            yield index, follower, outcome
+
+    def _next_chunksize(self):
+        if self.scheduler != Scheduler.GUIDED or self.__remaining is None:
+            return self.chunksize
+        workers = self.max_workers
+        if self.pool is not None:
+            workers = workers or self.pool.max_workers
+        workers = workers or utils.default_max_workers()
+        return utils.guided_chunksize(self.__remaining, workers, self.chunksize)
+
+    def _next_done(self, timeout=None):
+        while True:
+            try:
+                future = self.__done.get(timeout=timeout)
+            except queue.Empty:
+                return None
+            if future in self.__in_flight:
+                return future
+
+    def _outcomes(self, future, batch):
+        try:
+            value = future.result()
+        except Exception as exc:
+            for _, job in batch:
+                job.future = None
+            return [(False, exc)] * len(batch)
+        if not self._timed:
+            for _, job in batch:
+                job.future = None
+            return self._unpack(True, value, len(batch))
+        succeeded, result, worker_id, timings, call = value
+        if self.profile is not None:
+            self.profile.add_call(
+                batch[0][1].submitted_at,
+                call,
+                self.__done_at.pop(future, None),
+                user_time=sum(finished - started for started, finished in timings),
+            )
+        if len(timings) != len(batch):
+            # The chunk couldn't time its items, they share its timing
+            timings = timings * len(batch)
+        for (index, job), (started, finished) in zip(batch, timings):
+            job.future = None
+            job.started_at, job.finished_at = started, finished
+            job.worker = worker_id
+            if self.hooks is not None:
+                self.hooks.on_start(job)
+            if self.__records is not None:
+                self.__records.append(
+                    (self._job_key(index, job), job.submitted_at, started, finished, worker_id)
+                )
+        return self._unpack(succeeded, result, len(batch))
+
+    @staticmethod
+    def _unpack(succeeded, result, size):
+        if not succeeded:
+            return [(False, result)] * size
+        if size == 1:
+            return [(True, result)]
+        return result
+
+    @property
+    def stats(self):
+        """`ExecutionStats` of the jobs completed so far (`None` unless
+        they're recorded, see `stats=True`)."""
+        if self.__records is None:
+            return None
+        workers = self.max_workers
+        if self.pool is not None:
+            workers = workers or self.pool.max_workers
+        return stats.ExecutionStats(
+            self.__records,
+            started=self.__started_at,
+            finished=self.__finished_at or time.time(),
+            workers=workers,
+        )
+
+    def _wait_timeout(self, timeout):
+        if self.__expires_at is None:
+            return timeout
+        remaining = max(self.__expires_at - time.monotonic(), 0)
+        return remaining if timeout is None else min(timeout, remaining)
+
+    def _expired(self):
+        return self.__expires_at is not None and time.monotonic() >= self.__expires_at
+
+    def _cancel(self):
+        """Cancel every in-flight future (and the jobs not submitted yet).
+
+        Returns the batches that were in flight or waiting to be retried."""
+        self.__cancelled = True
+        self.cancel_token.cancel()
+        batches = list(self.__in_flight.items())
+        self.__in_flight.clear()
+        for future, _ in batches:
+            future.cancel()
+        retrying, self.__retrying = self.__retrying, []
+        return batches, retrying
+
+    def _cancel_expired(self):
+        # Jobs that couldn't finish before the deadline are reported as
+        # failed with a TimeoutException, the rest keep their results
+        batches, retrying = self._cancel()
+        expired = []
+        for future, batch in batches:
+            if future.done() and not future.cancelled():
+                outcomes = self._outcomes(future, batch)
+            else:
+                outcomes = [(False, exceptions.TimeoutException())] * len(batch)
+            expired.extend(
+                (index, job, outcome) for (index, job), outcome in zip(batch, outcomes)
+            )
+        for _, _, index, job in retrying:
+            expired.append((index, job, (False, job.history.pop())))
+        for index, job, outcome in expired:
+            yield index, job, outcome
+            yield from self._fan_out(job, outcome)
+        while self.__ready:
+            yield self.__ready.popleft()
+        if isinstance(self.__pending, dag.Graph):
+            self.__pending.cancel()
+        for index, job in self.__pending:
+            yield index, job, (False, exceptions.TimeoutException())
+
+    def _should_retry(self, job, outcome):
+        succeeded, exc = outcome
+        return (
+            not succeeded
+            and self.retries
+            and len(job.history) < self.retries
+            and isinstance(exc, self.retry_on)
+        )
+
+    def _retry_later(self, index, job, exc):
+        job.history.append(exc)
+        attempt = len(job.history)
+        if callable(self.backoff):
+            delay = self.backoff(attempt)
+        else:
+            delay = self.backoff * 2 ** (attempt - 1)
+        ready_at = time.monotonic() + delay
+        heapq.heappush(self.__retrying, (ready_at, id(job), index, job))
+
+    def _submit_retries(self):
+        """Resubmit the jobs whose backoff is over; returns the seconds until
+        the next one is (or `None` if there are no more)."""
+        now = time.monotonic()
+        while self.__retrying and self.__retrying[0][0] <= now:
+            _, _, index, job = heapq.heappop(self.__retrying)
+            self._submit([(index, job)])
+        if self.__retrying:
+            return self.__retrying[0][0] - now
+        return None
+
+    def _completed_unordered(self, timeout=None):
+        while self.__in_flight or self.__retrying or self.__ready:
+            if self.__ready:
+                yield self.__ready.popleft()
+                if self.__refill:
+                    self._submit_pending()
+                continue
+            wait_timeout = self._wait_timeout(timeout)
+            wake_up = self._submit_retries()
+            if self.checkpoint is not None:
+                # Buffered results are flushed even if no job completes
+                next_flush = self.checkpoint.flush_if_due()
+                if next_flush is not None and (wake_up is None or next_flush < wake_up):
+                    wake_up = next_flush
+            if wake_up is not None and (wait_timeout is None or wake_up < wait_timeout):
+                future = self._next_done(timeout=wake_up)
+                if future is None:
+                    continue
+            else:
+                future = self._next_done(timeout=wait_timeout)
+
+            if future is None:
+                if self._expired():
+                    yield from self._cancel_expired()
+                    return
+                self._cancel()
+                raise exceptions.TimeoutException()
+
+            batch = self.__in_flight.pop(future)
+            for (index, job), outcome in zip(batch, self._outcomes(future, batch)):
+                if self._should_retry(job, outcome):
+                    self._retry_later(index, job, outcome[1])
+                else:
+                    yield index, job, outcome
+                    if self.dedupe:
+                        yield from self._fan_out(job, outcome)
+            if self.__refill:
+                self._submit_pending()
+
+    def _completed(self, ordered=True, timeout=None):
+        """Yield `(index, job, outcome)` as futures finish, refilling the
+        in-flight window after each one.
+
+        `outcome` is a `(succeeded, result_or_exception)` pair. With `ordered`
+        jobs finished early are held until the previous ones are yielded."""
+        completed = self._completed_unordered(timeout=timeout)
+        if isinstance(self.jobs, dag.Graph):
+            completed = self._resolve_dependents(completed)
+        if self.checkpoint is not None:
+            completed = self._checkpointed(completed)
+        if not ordered:
+            yield from completed
+            return
+        next_index = 0
+        for index, job, outcome in completed:
+            self.__reordering[index] = (job, outcome)
+            while next_index in self.__reordering:
+                job, outcome = self.__reordering.pop(next_index)
+                yield next_index, job, outcome
+                next_index += 1
+
+    def _resolve_dependents(self, completed):
+        # Jobs whose dependencies succeeded get ready (they're submitted once
+        # this one is consumed), the dependents of failed ones fail too
+        for index, job, outcome in completed:
+            failed = self.jobs.resolve(index, outcome)
+            if failed:
+                self.__ready.extend(failed)
+                if self.progress is not None:
+                    self.progress.update(len(failed), len(failed))
+            yield index, job, outcome
+
+    def _checkpointed(self, completed):
+        for index, job, outcome in completed:
+            succeeded, result = outcome
+            if succeeded:
+                self.checkpoint.add(self._job_key(index, job), result)
+            yield index, job, outcome
 
     def __enter__(self):
         self.start()
@@ -79,63 +655,261 @@ class BaseParallelExecutor:
     def __exit__(self, *args, **kwargs):
         self.shutdown()
 
-    def results(self, timeout=None):
-        if self.__results:
-            return self.__results
-
+    def _check_started(self):
         if self.__status == ParallelStatus.NOT_STARTED:
             raise exceptions.ParallelStatusException(errors.STATUS_EXECUTOR_NOT_STARTED)
 
-        ResultClass = self.ResultClass
-        self.__results = ResultClass()
-
-        for job in self.jobs:
-            try:
-                result = job.future.result(timeout=(timeout or self.timeout))
-            except cf.TimeoutError as e:
-                raise exceptions.TimeoutException() from e
-            except Exception as exc:
-                if not self.silent:
-                    self.__status = ParallelStatus.FAILED
-                    raise exc
-                self.__results.new_result(job.name, FailedTask(job, exc))
+    def _resolve(self, job, outcome):
+        succeeded, result = outcome
+        if self.hooks is not None:
+            if succeeded:
+                self.hooks.on_complete(job, result)
             else:
-                self.__results.new_result(job.name, result)
+                self.hooks.on_error(job, result)
+        if not succeeded:
+            job.status = ParallelStatus.FAILED
+            if not self.silent:
+                # Fail fast: there's no point in running the rest of the batch
+                self.__status = ParallelStatus.FAILED
+                self._cancel()
+                raise result
+            return FailedTask(job, result)
+        job.status = ParallelStatus.DONE
+        return result
+
+    def results(self, timeout=None):
+        if self.__results:
+            return self.__results
 
+        self._check_started()
+
+        timeout = timeout or self.timeout
+        if self.sink is not None:
+            results = self._write_results(timeout)
+        else:
+            results = self._collect_results(timeout)
+
+        self.__finished_at = time.time()
+        if self.progress is not None:
+            self.progress.finish()
+        results.stats = self.stats
+        results.profile = self.profile
+        self.__results = results
         self.__status = ParallelStatus.DONE
         return self.__results
 
+    def _collect_results(self, timeout):
+        # Jobs are resolved in completion order (so failures surface as soon
+        # as they happen), results are then reported in submission order
+        outcomes = {}
+        for index, job, outcome in self._completed(ordered=False, timeout=timeout):
+            outcomes[index] = (job, self._resolve(job, outcome))
+
+        results = self.ResultClass()
+        for index in range(len(outcomes)):
+            job, result = outcomes.pop(index)
+            results.new_result(job.name, result)
+        return results
+
+    def _write_results(self, timeout):
+        results = SinkResult(self.sink)
+        self.sink.open()
+        try:
+            for index, job, outcome in self._completed(ordered=False, timeout=timeout):
+                results.new_result(self._job_key(index, job), self._resolve(job, outcome))
+        finally:
+            self.sink.close()
+        return results
+
+    def iter_results(self, ordered=True, timeout=None):
+        """Yield `(name, result)` pairs as soon as they're available.
+
+        Sequential jobs are named after their position. With `ordered=False`
+        results are yielded in completion order.
+        """
+        self._check_started()
+        timeout = timeout or self.timeout
+
+        for index, job, outcome in self._completed(ordered=ordered, timeout=timeout):
+            yield self._job_key(index, job), self._resolve(job, outcome)
+
+        self.__finished_at = time.time()
+        if self.__status == ParallelStatus.STARTED:
+            self.__status = ParallelStatus.DONE
+
+    def as_completed(self, timeout=None):
+        return self.iter_results(ordered=False, timeout=timeout)
+
+    @staticmethod
+    def _job_key(index, job):
+        return index if job.name is None else job.name
+
     def shutdown(self):
-        self.__executor.shutdown()
+        if self.progress is not None:
+            self.progress.finish()
+        if self.checkpoint is not None:
+            self.checkpoint.close()
+        if self.hooks is not None:
+            self.hooks.on_batch_done(self)
+        if self.pool is not None:
+            # Workers belong to the pool, they outlive this batch
+            return
+        if not self.__cancelled:
+            self.__executor.shutdown()
+            return
+        # Don't block on jobs that were already running when cancelled
+        if sys.version_info >= (3, 9):
+            self.__executor.shutdown(wait=False, cancel_futures=True)
+        elif isinstance(self.__executor, cf.ProcessPoolExecutor):
+            # Before 3.9, process pools shut down without waiting can hang
+            # the interpreter at exit. The pending futures were cancelled
+            # already (see `_cancel`), only the running jobs are waited for
+            self.__executor.shutdown()
+        else:
+            self.__executor.shutdown(wait=False)
 
 
 class ThreadExecutor(BaseParallelExecutor):
-    def _get_executor_class(self):
+    @classmethod
+    def _get_executor_class(cls):
         return cf.ThreadPoolExecutor
 
+    def _build_call(self, batch):
+        # Threads can't be interrupted, jobs can poll `parallel.cancelled()`
+        fn, args, kwargs = super()._build_call(batch)
+        return worker.run_with_token, (self.cancel_token, fn, args, kwargs), {}
+
 
 class ProcessExecutor(BaseParallelExecutor):
-    def _get_executor_class(self):
+    _token = None
+
+    @classmethod
+    def _get_executor_class(cls):
         return cf.ProcessPoolExecutor
 
+    @classmethod
+    def _default_max_workers(cls):
+        return os.cpu_count() or 1
+
+    @classmethod
+    def _new_executor(cls, max_workers, budget, token=None, fn=None, extras=None):
+        if sys.version_info < (3, 7):
+            # No pool initializers, workers cap their threads on their first
+            # call (see `_build_call`)
+            return cf.ProcessPoolExecutor(max_workers=max_workers)
+        # Workers cap the threads of BLAS/OpenMP runtimes to their budget
+        return cf.ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=worker.initialize,
+            initargs=(budget, token, fn, extras),
+        )
+
+    def _create_executor(self):
+        if self.fn is None or sys.version_info < (3, 7):
+            # Pool initializers need Python 3.7+, otherwise `fn` and `extras`
+            # travel with each call
+            return super()._create_executor()
+        # `fn` and `extras` are registered once per worker process, jobs only
+        # carry a token and their own arguments
+        self._token = uuid.uuid4().hex
+        return self._new_executor(
+            self.max_workers, self._budget, self._token, self.fn, self.extras
+        )
+
+    def _strip_extras(self, kwargs):
+        # Jobs' kwargs already include (the same objects of) the extras
+        extras = self.extras
+        if not extras:
+            return kwargs
+        if isinstance(kwargs, _SharedKwargs):
+            # Only the extras, shared by the jobs
+            return {}
+        return {
+            key: value
+            for key, value in kwargs.items()
+            if key not in extras or extras[key] is not value
+        }
+
+    def _build_call(self, batch):
+        if sys.version_info < (3, 7):
+            fn, args, kwargs = super()._build_call(batch)
+            return worker.run_limited, (self._budget, fn, args, kwargs), {}
+        if self._token is None or any(job.fn is not self.fn for _, job in batch):
+            return super()._build_call(batch)
+        if len(batch) == 1:
+            _, job = batch[0]
+            return (
+                worker.run_registered,
+                (self._token, job.args, self._strip_extras(job.kwargs)),
+                {},
+            )
+        items = [(job.args, self._strip_extras(job.kwargs)) for _, job in batch]
+        return worker.run_registered_chunk, (self._token, items), {}
+
+
+class AsyncioExecutor(BaseParallelExecutor):
+    _runner = staticmethod(aio.timed)
+    _run = staticmethod(aio.run)
+
+    @classmethod
+    def _get_executor_class(cls):
+        return aio.AsyncioPoolExecutor
+
+    def _build_call(self, batch):
+        if len(batch) == 1:
+            return super()._build_call(batch)
+        items = [(job.args, job.kwargs) for _, job in batch]
+        return aio.run_chunk, (batch[0][1].fn, items), {}
+
 
 EXECUTOR_MAPPING = {
     ExecutorStrategy.THREAD_EXECUTOR: ThreadExecutor,
     ExecutorStrategy.PROCESS_EXECUTOR: ProcessExecutor,
+    ExecutorStrategy.ASYNCIO_EXECUTOR: AsyncioExecutor,
 }
 
 
 class ParallelHelper:
-    def __init__(self, executor=ExecutorStrategy.THREAD_EXECUTOR):
+    def __init__(
+        self,
+        executor=ExecutorStrategy.THREAD_EXECUTOR,
+        pool=None,
+        scheduler=Scheduler.FIFO,
+        cost=None,
+        hooks=None,
+    ):
+        if pool is not None:
+            executor = pool.ExecutorClass
         if isinstance(executor, ExecutorStrategy):
             executor = EXECUTOR_MAPPING[executor]
         self.ExecutorClass = executor
-
-    def get_result_class(self, params):
-        # return SequentialMapResult
-        if isinstance(params, collections.abc.Sequence):
-            return SequentialMapResult
-        return NamedMapResult
+        self.pool = pool
+        self.scheduler = Scheduler(scheduler)
+        # `cost` receives the same arguments as the parallelized function (each
+        # item of the collection in `split`, parts cost the sum of theirs)
+        self.cost = cost
+        self.hooks = hooks
+
+    def get_job_cost(self):
+        if self.cost is None:
+            return None
+        return lambda job: self.cost(*job.args, **job.kwargs)
+
+    def get_result_class(self, params, dtype=None):
+        if dtype is not None:
+            if isinstance(params, collections.abc.Mapping):
+                raise ValueError("dtype is only supported for sequential params")
+            return functools.partial(ColumnarMapResult, dtype)
+        if isinstance(params, collections.abc.Mapping):
+            return NamedMapResult
+        return SequentialMapResult
+
+    def get_chunksize(self, chunksize, params, max_workers=None):
+        if chunksize != "auto":
+            return chunksize or 1
+        if self.pool is not None:
+            max_workers = max_workers or self.pool.max_workers
+        return utils.auto_chunksize(params, max_workers or os.cpu_count() or 1)
 
     def map(
         self,
@@ -146,17 +920,51 @@ class ParallelHelper:
         max_workers=None,
         timeout=None,
         silent=False,
+        max_in_flight=None,
+        chunksize=1,
+        deadline=None,
+        stats=False,
+        retries=0,
+        backoff=0,
+        retry_on=(Exception,),
+        progress=None,
+        cache=None,
+        dedupe=False,
+        profile=None,
+        dtype=None,
+        sink=None,
+        checkpoint=None,
     ):
-        jobs = ParallelJob.build_for_callable_from_params(
-            fn, params, extras=extras, unpack_arguments=unpack_arguments
-        )
-        ResultClass = self.get_result_class(params)
+        build_jobs = ParallelJob.build_for_callable_from_params
+        if max_in_flight or sink is not None:
+            build_jobs = ParallelJob.iter_for_callable_from_params
+        jobs = build_jobs(fn, params, extras=extras, unpack_arguments=unpack_arguments)
+        ResultClass = self.get_result_class(params, dtype)
         with self.ExecutorClass(
             jobs,
             max_workers=max_workers,
             timeout=timeout,
             silent=silent,
             ResultClass=ResultClass,
+            pool=self.pool,
+            scheduler=self.scheduler,
+            cost=self.get_job_cost(),
+            hooks=self.hooks,
+            progress=progress,
+            profile=profile,
+            sink=sink,
+            checkpoint=checkpoint,
+            cache=cache,
+            dedupe=dedupe,
+            max_in_flight=max_in_flight,
+            deadline=deadline,
+            stats=stats,
+            retries=retries,
+            backoff=backoff,
+            retry_on=retry_on,
+            chunksize=self.get_chunksize(chunksize, params, max_workers),
+            fn=fn,
+            extras=extras,
         ) as ex:
             return ex.results()
 
@@ -169,10 +977,21 @@ class ParallelHelper:
         max_workers=None,
         timeout=None,
         silent=False,
+        max_in_flight=None,
+        chunksize=1,
+        deadline=None,
+        stats=False,
+        retries=0,
+        backoff=0,
+        retry_on=(Exception,),
+        progress=None,
+        cache=None,
+        dedupe=False,
     ):
-        jobs = ParallelJob.build_for_callable_from_params(
-            fn, params, extras=extras, unpack_arguments=unpack_arguments
-        )
+        build_jobs = ParallelJob.build_for_callable_from_params
+        if max_in_flight:
+            build_jobs = ParallelJob.iter_for_callable_from_params
+        jobs = build_jobs(fn, params, extras=extras, unpack_arguments=unpack_arguments)
         ResultClass = self.get_result_class(params)
         ex = self.ExecutorClass(
             jobs,
@@ -180,9 +999,79 @@ class ParallelHelper:
             timeout=timeout,
             silent=silent,
             ResultClass=ResultClass,
+            pool=self.pool,
+            scheduler=self.scheduler,
+            cost=self.get_job_cost(),
+            hooks=self.hooks,
+            progress=progress,
+            cache=cache,
+            dedupe=dedupe,
+            max_in_flight=max_in_flight,
+            deadline=deadline,
+            stats=stats,
+            retries=retries,
+            backoff=backoff,
+            retry_on=retry_on,
+            chunksize=self.get_chunksize(chunksize, params, max_workers),
+            fn=fn,
+            extras=extras,
         )
         return ex
 
+    def imap(
+        self,
+        fn,
+        params,
+        ordered=True,
+        extras=None,
+        unpack_arguments=True,
+        max_workers=None,
+        timeout=None,
+        silent=False,
+        max_in_flight=None,
+        chunksize=1,
+        deadline=None,
+        stats=False,
+        retries=0,
+        backoff=0,
+        retry_on=(Exception,),
+        progress=None,
+        cache=None,
+        dedupe=False,
+    ):
+        build_jobs = ParallelJob.build_for_callable_from_params
+        if max_in_flight:
+            build_jobs = ParallelJob.iter_for_callable_from_params
+        jobs = build_jobs(fn, params, extras=extras, unpack_arguments=unpack_arguments)
+        with self.ExecutorClass(
+            jobs,
+            max_workers=max_workers,
+            timeout=timeout,
+            silent=silent,
+            pool=self.pool,
+            scheduler=self.scheduler,
+            cost=self.get_job_cost(),
+            hooks=self.hooks,
+            progress=progress,
+            cache=cache,
+            dedupe=dedupe,
+            max_in_flight=max_in_flight,
+            deadline=deadline,
+            stats=stats,
+            retries=retries,
+            backoff=backoff,
+            retry_on=retry_on,
+            chunksize=self.get_chunksize(chunksize, params, max_workers),
+            fn=fn,
+            extras=extras,
+        ) as ex:
+            try:
+                yield from ex.iter_results(ordered=ordered)
+            except GeneratorExit:
+                # Closed early (ie: `break`), the rest of the jobs don't run
+                ex._cancel()
+                raise
+
     def par(
         self,
         params,
@@ -191,10 +1080,24 @@ class ParallelHelper:
         max_workers=None,
         timeout=None,
         silent=False,
+        max_in_flight=None,
+        deadline=None,
+        stats=False,
+        retries=0,
+        backoff=0,
+        retry_on=(Exception,),
+        progress=None,
+        profile=None,
+        sink=None,
+        checkpoint=None,
+        dag=False,
     ):
-        jobs = ParallelJob.build_jobs_from_params(
-            params, extras=extras, unpack_arguments=unpack_arguments
-        )
+        build_jobs = ParallelJob.build_jobs_from_params
+        if max_in_flight or sink is not None:
+            build_jobs = ParallelJob.iter_jobs_from_params
+        if dag:
+            build_jobs = Graph
+        jobs = build_jobs(params, extras=extras, unpack_arguments=unpack_arguments)
         ResultClass = self.get_result_class(params)
         with self.ExecutorClass(
             jobs,
@@ -202,6 +1105,20 @@ class ParallelHelper:
             timeout=timeout,
             silent=silent,
             ResultClass=ResultClass,
+            pool=self.pool,
+            scheduler=self.scheduler,
+            cost=self.get_job_cost(),
+            hooks=self.hooks,
+            progress=progress,
+            profile=profile,
+            sink=sink,
+            checkpoint=checkpoint,
+            max_in_flight=max_in_flight,
+            deadline=deadline,
+            stats=stats,
+            retries=retries,
+            backoff=backoff,
+            retry_on=retry_on,
         ) as ex:
             return ex.results()
 
@@ -209,28 +1126,172 @@ class ParallelHelper:
         self,
         collection,
         fn,
-        executor=ExecutorStrategy.THREAD_EXECUTOR,
+        executor=None,
         workers=None,
         timeout=None,
         extras=None,
+        chunks=None,
+        strategy=utils.CONTIGUOUS,
+        chunk_size=None,
+        weight=len,
+        transport=None,
+        deadline=None,
+        stats=False,
+        progress=None,
+        profile=None,
+        sink=None,
     ):
-        workers = workers or min(32, (os.cpu_count() or 1) + 4)
-
-        chunks = utils.split_collection(collection, workers)
+        ExecutorClass, pool = self.ExecutorClass, self.pool
+        if executor is not None:
+            ExecutorClass = EXECUTOR_MAPPING.get(executor, executor)
+            if ExecutorClass is not self.ExecutorClass:
+                pool = None
+
+        if pool is not None:
+            workers = workers or pool.max_workers
+        workers = workers or utils.default_max_workers()
+
+        if profile is True:
+            # A single report for all the parts
+            profile = ProfileReport()
+
+        if self.scheduler == Scheduler.GUIDED and strategy == utils.CONTIGUOUS:
+            strategy = utils.GUIDED
+            chunks = chunks or workers
+
+        def execute(jobs, cost=None):
+            with ExecutorClass(
+                jobs,
+                max_workers=workers,
+                timeout=timeout,
+                ResultClass=SequentialMapResult,
+                pool=pool,
+                cost=cost,
+                hooks=self.hooks,
+                progress=progress,
+                profile=profile,
+                sink=sink,
+                deadline=deadline,
+                stats=stats,
+            ) as ex:
+                return ex.results()
+
+        if transport == shm.SHARED_MEMORY and issubclass(ExecutorClass, ProcessExecutor):
+            if sink is not None:
+                raise ValueError("The shared memory transport doesn't support sinks")
+            if strategy == utils.ROUND_ROBIN:
+                raise ValueError("The shared memory transport requires contiguous parts")
+            bounds = utils.split_bounds(
+                collection, chunks or workers, strategy, chunk_size, weight
+            )
+            results = shm.map_partitions(execute, collection, fn, bounds, extras)
+            return self._with_profile(utils.merge_chunks(results), profile)
+
+        parts = utils.split_collection(
+            collection,
+            chunks or workers,
+            strategy=strategy,
+            chunk_size=chunk_size,
+            weight=weight,
+        )
         jobs = [
-            ParallelJob(fn, None, [chunk], (extras or {}).copy())
-            for chunk in chunks
+            ParallelJob(fn, None, [part], (extras or {}).copy())
+            for part in parts
         ]
+        cost = None
+        if self.cost is not None:
+            cost = lambda job: sum(self.cost(item) for item in job.args[0])
+        if sink is not None:
+            # Each part's result is written (keyed by the part's index)
+            # instead of merged
+            return execute(jobs, cost=cost)
+        results = utils.merge_chunks(execute(jobs, cost=cost), strategy=strategy)
+        return self._with_profile(results, profile)
+
+    @staticmethod
+    def _with_profile(results, profile):
+        # Lists can carry the report, NumPy arrays can't (pass a
+        # `ProfileReport` instead of `True` to get it)
+        if profile is None or not isinstance(results, list):
+            return results
+        results = SequentialMapResult(results)
+        results.profile = profile
+        return results
+
+
+_live_pools = weakref.WeakSet()
+
+
+@atexit.register
+def _shutdown_live_pools():
+    for pool in list(_live_pools):
+        pool.shutdown(wait=False)
 
-        with self.ExecutorClass(
-            jobs,
-            max_workers=workers,
-            timeout=timeout,
-            ResultClass=SequentialMapResult,
-        ) as ex:
-            results = ex.results()
-            return list(itertools.chain.from_iterable(results))
-            #[item for sublist in l for item in sublist]
+
+class Pool(ParallelHelper):
+    """A long lived group of workers, reused across map/par/split calls.
+
+    Workers are created lazily on first use (or with `start()`) and kept
+    until `shutdown()` is invoked, the pool is used as a context manager,
+    or the interpreter exits.
+    """
+
+    def __init__(
+        self,
+        executor=ExecutorStrategy.THREAD_EXECUTOR,
+        max_workers=None,
+        scheduler=Scheduler.FIFO,
+        cost=None,
+        hooks=None,
+    ):
+        super().__init__(executor, scheduler=scheduler, cost=cost, hooks=hooks)
+        self.pool = self
+        self.max_workers = max_workers or worker.budget()
+        self._executor = None
+        self._closed = False
+        self._lock = threading.Lock()
+        _live_pools.add(self)
+
+    @property
+    def started(self):
+        return self._executor is not None
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def get_executor(self):
+        with self._lock:
+            if self._closed:
+                raise exceptions.ParallelStatusException(errors.STATUS_POOL_CLOSED)
+            if self._executor is None:
+                ExecutorClass = self.ExecutorClass
+                budget = utils.nested_budget(
+                    self.max_workers or ExecutorClass._default_max_workers()
+                )
+                self._executor = ExecutorClass._new_executor(self.max_workers, budget)
+            return self._executor
+
+    def start(self):
+        self.get_executor()
+        return self
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._closed = True
+        _live_pools.discard(self)
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args, **kwargs):
+        self.shutdown()
+
+    def decorate(self, *args, **kwargs):
+        return decorate(*args, pool=self, **kwargs)
 
 
 def map(
@@ -242,8 +1303,22 @@ def map(
     extras=None,
     silent=False,
     unpack_arguments=True,
+    max_in_flight=None,
+    chunksize=1,
+    deadline=None,
+    stats=False,
+    retries=0,
+    backoff=0,
+    retry_on=(Exception,),
+    hooks=None,
+    progress=None,
+    dedupe=False,
+    profile=None,
+    dtype=None,
+    sink=None,
+    checkpoint=None,
 ):
-    return ParallelHelper(executor).map(
+    return ParallelHelper(executor, hooks=hooks).map(
         fn,
         params,
         extras=extras,
@@ -251,6 +1326,19 @@ def map(
         max_workers=max_workers,
         timeout=timeout,
         silent=silent,
+        max_in_flight=max_in_flight,
+        deadline=deadline,
+        stats=stats,
+        retries=retries,
+        backoff=backoff,
+        retry_on=retry_on,
+        chunksize=chunksize,
+        progress=progress,
+        profile=profile,
+        dedupe=dedupe,
+        dtype=dtype,
+        sink=sink,
+        checkpoint=checkpoint,
     )
 
 
@@ -263,15 +1351,76 @@ def async_map(
     extras=None,
     silent=False,
     unpack_arguments=True,
+    max_in_flight=None,
+    chunksize=1,
+    deadline=None,
+    stats=False,
+    retries=0,
+    backoff=0,
+    retry_on=(Exception,),
+    hooks=None,
+    progress=None,
+    dedupe=False,
+):
+    return ParallelHelper(executor, hooks=hooks).async_map(
+        fn,
+        params,
+        extras=extras,
+        unpack_arguments=unpack_arguments,
+        max_workers=max_workers,
+        timeout=timeout,
+        silent=silent,
+        max_in_flight=max_in_flight,
+        deadline=deadline,
+        stats=stats,
+        retries=retries,
+        backoff=backoff,
+        retry_on=retry_on,
+        chunksize=chunksize,
+        progress=progress,
+        dedupe=dedupe,
+    )
+
+
+def imap(
+    fn,
+    params,
+    ordered=True,
+    executor=ExecutorStrategy.THREAD_EXECUTOR,
+    max_workers=None,
+    timeout=None,
+    extras=None,
+    silent=False,
+    unpack_arguments=True,
+    max_in_flight=None,
+    chunksize=1,
+    deadline=None,
+    stats=False,
+    retries=0,
+    backoff=0,
+    retry_on=(Exception,),
+    hooks=None,
+    progress=None,
+    dedupe=False,
 ):
-    return ParallelHelper(executor).async_map(
+    return ParallelHelper(executor, hooks=hooks).imap(
         fn,
         params,
+        ordered=ordered,
         extras=extras,
         unpack_arguments=unpack_arguments,
         max_workers=max_workers,
         timeout=timeout,
         silent=silent,
+        max_in_flight=max_in_flight,
+        deadline=deadline,
+        stats=stats,
+        retries=retries,
+        backoff=backoff,
+        retry_on=retry_on,
+        chunksize=chunksize,
+        progress=progress,
+        dedupe=dedupe,
     )
 
 
@@ -283,14 +1432,37 @@ def par(
     extras=None,
     silent=False,
     unpack_arguments=True,
+    max_in_flight=None,
+    deadline=None,
+    stats=False,
+    retries=0,
+    backoff=0,
+    retry_on=(Exception,),
+    hooks=None,
+    progress=None,
+    profile=None,
+    sink=None,
+    checkpoint=None,
+    dag=False,
 ):
-    return ParallelHelper(executor).par(
+    return ParallelHelper(executor, hooks=hooks).par(
         params,
         extras=extras,
         unpack_arguments=unpack_arguments,
         max_workers=max_workers,
         timeout=timeout,
         silent=silent,
+        max_in_flight=max_in_flight,
+        deadline=deadline,
+        stats=stats,
+        retries=retries,
+        backoff=backoff,
+        retry_on=retry_on,
+        progress=progress,
+        profile=profile,
+        sink=sink,
+        checkpoint=checkpoint,
+        dag=dag,
     )
 
 
@@ -301,21 +1473,100 @@ def split(
     workers=None,
     timeout=None,
     extras=None,
+    chunks=None,
+    strategy=utils.CONTIGUOUS,
+    chunk_size=None,
+    weight=len,
+    transport=None,
+    deadline=None,
+    stats=False,
+    hooks=None,
+    progress=None,
+    profile=None,
+    sink=None,
 ):
-    return ParallelHelper(executor).split(
-        collection, fn, extras=extras, workers=workers, timeout=timeout
+    return ParallelHelper(executor, hooks=hooks).split(
+        collection,
+        fn,
+        extras=extras,
+        workers=workers,
+        timeout=timeout,
+        chunks=chunks,
+        strategy=strategy,
+        chunk_size=chunk_size,
+        weight=weight,
+        transport=transport,
+        deadline=deadline,
+        stats=stats,
+        progress=progress,
+        profile=profile,
+        sink=sink,
+    )
+
+
+async def amap(
+    fn,
+    params,
+    max_workers=None,
+    timeout=None,
+    extras=None,
+    silent=False,
+    unpack_arguments=True,
+):
+    jobs = ParallelJob.build_for_callable_from_params(
+        fn, params, extras=extras, unpack_arguments=unpack_arguments
+    )
+    ResultClass = ParallelHelper().get_result_class(params)
+    return await aio.run_jobs(
+        jobs, ResultClass, max_workers=max_workers, timeout=timeout, silent=silent
+    )
+
+
+async def apar(
+    params,
+    max_workers=None,
+    timeout=None,
+    extras=None,
+    silent=False,
+    unpack_arguments=True,
+):
+    jobs = ParallelJob.build_jobs_from_params(
+        params, extras=extras, unpack_arguments=unpack_arguments
+    )
+    ResultClass = ParallelHelper().get_result_class(params)
+    return await aio.run_jobs(
+        jobs, ResultClass, max_workers=max_workers, timeout=timeout, silent=silent
     )
 
 
 class ParallelCallable:
     def __init__(
-        self, fn, executor, timeout, max_workers,
+        self,
+        fn,
+        executor,
+        timeout,
+        max_workers,
+        pool=None,
+        retries=0,
+        backoff=0,
+        retry_on=(Exception,),
+        cache=None,
     ):
 
         self.fn = fn
         self.executor = executor
         self.timeout = timeout
         self.max_workers = max_workers
+        self.pool = pool
+        self.retries = retries
+        self.backoff = backoff
+        self.retry_on = retry_on
+        self.cache = cache
+
+    def get_helper(self, executor=None):
+        if self.pool is not None and executor is None:
+            return self.pool
+        return ParallelHelper(executor or self.executor)
 
     def map(
         self,
@@ -326,9 +1577,21 @@ class ParallelCallable:
         extras=None,
         silent=False,
         unpack_arguments=True,
+        max_in_flight=None,
+        chunksize=1,
+        deadline=None,
+        stats=False,
+        retries=None,
+        backoff=None,
+        retry_on=None,
+        progress=None,
+        dedupe=False,
+        profile=None,
+        dtype=None,
+        sink=None,
+        checkpoint=None,
     ):
-        executor = executor or self.executor
-        return ParallelHelper(executor).map(
+        return self.get_helper(executor).map(
             self.fn,
             params,
             extras=extras,
@@ -336,6 +1599,20 @@ class ParallelCallable:
             max_workers=(max_workers or self.max_workers),
             timeout=(timeout or self.timeout),
             silent=silent,
+            max_in_flight=max_in_flight,
+            deadline=deadline,
+            stats=stats,
+            retries=(self.retries if retries is None else retries),
+            backoff=(self.backoff if backoff is None else backoff),
+            retry_on=(self.retry_on if retry_on is None else retry_on),
+            chunksize=chunksize,
+            progress=progress,
+            cache=self.cache,
+            dedupe=dedupe,
+            profile=profile,
+            dtype=dtype,
+            sink=sink,
+            checkpoint=checkpoint,
         )
 
     def async_map(
@@ -347,9 +1624,17 @@ class ParallelCallable:
         extras=None,
         silent=False,
         unpack_arguments=True,
+        max_in_flight=None,
+        chunksize=1,
+        deadline=None,
+        stats=False,
+        retries=None,
+        backoff=None,
+        retry_on=None,
+        progress=None,
+        dedupe=False,
     ):
-        executor = executor or self.executor
-        return ParallelHelper(executor).async_map(
+        return self.get_helper(executor).async_map(
             self.fn,
             params,
             extras=extras,
@@ -357,6 +1642,57 @@ class ParallelCallable:
             max_workers=(max_workers or self.max_workers),
             timeout=(timeout or self.timeout),
             silent=silent,
+            max_in_flight=max_in_flight,
+            deadline=deadline,
+            stats=stats,
+            retries=(self.retries if retries is None else retries),
+            backoff=(self.backoff if backoff is None else backoff),
+            retry_on=(self.retry_on if retry_on is None else retry_on),
+            chunksize=chunksize,
+            progress=progress,
+            cache=self.cache,
+            dedupe=dedupe,
+        )
+
+    def imap(
+        self,
+        params,
+        ordered=True,
+        executor=None,
+        max_workers=None,
+        timeout=None,
+        extras=None,
+        silent=False,
+        unpack_arguments=True,
+        max_in_flight=None,
+        chunksize=1,
+        deadline=None,
+        stats=False,
+        retries=None,
+        backoff=None,
+        retry_on=None,
+        progress=None,
+        dedupe=False,
+    ):
+        return self.get_helper(executor).imap(
+            self.fn,
+            params,
+            ordered=ordered,
+            extras=extras,
+            unpack_arguments=unpack_arguments,
+            max_workers=(max_workers or self.max_workers),
+            timeout=(timeout or self.timeout),
+            silent=silent,
+            max_in_flight=max_in_flight,
+            deadline=deadline,
+            stats=stats,
+            retries=(self.retries if retries is None else retries),
+            backoff=(self.backoff if backoff is None else backoff),
+            retry_on=(self.retry_on if retry_on is None else retry_on),
+            chunksize=chunksize,
+            progress=progress,
+            cache=self.cache,
+            dedupe=dedupe,
         )
 
     def __call__(self, *args, **kwargs):
@@ -370,25 +1706,41 @@ class ParallelDecorator:
         executor=ExecutorStrategy.THREAD_EXECUTOR,
         timeout=None,
         max_workers=None,
+        pool=None,
+        retries=0,
+        backoff=0,
+        retry_on=(Exception,),
+        cache=None,
     ):
 
         self.fn = fn
-        self.thread = ParallelCallable(
-            fn,
-            ExecutorStrategy.THREAD_EXECUTOR,
+        # `cache=True` (in memory LRU), a path (on disk) or a cache instance,
+        # shared by all the executors
+        if cache is True:
+            cache = _cache.MemoryCache()
+        elif isinstance(cache, (str, os.PathLike)):
+            cache = _cache.DiskCache(cache)
+        self.cache = cache
+        options = dict(
             timeout=timeout,
             max_workers=max_workers,
+            retries=retries,
+            backoff=backoff,
+            retry_on=retry_on,
+            cache=cache,
         )
-        self.process = ParallelCallable(
-            fn,
-            ExecutorStrategy.PROCESS_EXECUTOR,
-            timeout=timeout,
-            max_workers=max_workers,
-        )
-        if executor == ExecutorStrategy.THREAD_EXECUTOR:
+        self.thread = ParallelCallable(fn, ExecutorStrategy.THREAD_EXECUTOR, **options)
+        self.process = ParallelCallable(fn, ExecutorStrategy.PROCESS_EXECUTOR, **options)
+        if pool is not None:
+            self.default_executor = ParallelCallable(
+                fn, pool.ExecutorClass, pool=pool, **options
+            )
+        elif executor == ExecutorStrategy.THREAD_EXECUTOR:
             self.default_executor = self.thread
-        else:
+        elif executor == ExecutorStrategy.PROCESS_EXECUTOR:
             self.default_executor = self.process
+        else:
+            self.default_executor = ParallelCallable(fn, executor, **options)
 
     map = lambda self, *args, **kwargs: self.default_executor.map(*args, **kwargs)
 
@@ -396,6 +1748,8 @@ class ParallelDecorator:
         *args, **kwargs
     )
 
+    imap = lambda self, *args, **kwargs: self.default_executor.imap(*args, **kwargs)
+
     def future(self, *args, **kwargs):
         return job(self.fn, *args, **kwargs)
 
@@ -406,7 +1760,7 @@ class ParallelDecorator:
 def decorate(*args, **kwargs):
     if len(args) == 1 and callable(args[0]):
         # Invoked without parameters
-        obj = ParallelDecorator(args[0])
+        obj = ParallelDecorator(args[0], **kwargs)
         return obj
     else:
 
@@ -425,7 +1779,8 @@ arg.__doc__ = "TODO"
 
 
 def job(*args, **kwargs):
-    "TODO"
+    """A job for `par`: `parallel.job(fn, *args, **kwargs)`. With
+    `dag=True` its arguments can be other jobs (replaced by their results)."""
     fn, *args = args
     return ParallelJob(fn, None, args, kwargs)
 
@@ -0,0 +1,152 @@
+"""Support for coroutine functions (`ASYNCIO_EXECUTOR`, `amap` and `apar`)."""
+import sys
+import asyncio
+import time
+import inspect
+import weakref
+import threading
+import concurrent.futures as cf
+
+from . import worker
+from . import exceptions
+from .models import FailedTask
+
+
+if sys.version_info >= (3, 7):
+    current_task, all_tasks = asyncio.current_task, asyncio.all_tasks
+else:  # pragma: no cover
+    current_task, all_tasks = asyncio.Task.current_task, asyncio.Task.all_tasks
+
+# `max_workers` semaphores of the `AsyncioPoolExecutor`s, by event loop. Each
+# job takes it (not each submitted call, which might be a whole chunk)
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def _semaphore():
+    return _semaphores.get(asyncio.get_event_loop())
+
+
+async def call(fn, args, kwargs, semaphore=None):
+    if semaphore is not None:
+        async with semaphore:
+            return await call(fn, args, kwargs)
+    result = fn(*args, **kwargs)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+async def run(fn, args, kwargs, budget=None):
+    # Same as `worker.run`, for coroutine functions
+    return await call(fn, args, kwargs, semaphore=None if fn is run_chunk else _semaphore())
+
+
+async def timed(fn, args, kwargs, context=None, profile=False, budget=None):
+    # Same as `worker.timed`, for coroutine functions. They aren't profiled
+    # (nor given a budget): others run in the same thread while they wait
+    if context is not None:
+        with context():
+            return await timed(fn, args, kwargs)
+    started = time.time()
+    try:
+        # Chunks take the semaphore per item
+        semaphore = None if fn is run_chunk else _semaphore()
+        succeeded, result = True, await call(fn, args, kwargs, semaphore=semaphore)
+    except Exception as exc:
+        succeeded, result = False, exc
+    finished = time.time()
+    return succeeded, result, worker.worker_id(), [(started, finished)], (started, finished, None)
+
+
+async def run_chunk(fn, items):
+    semaphore = _semaphore()
+    results = await asyncio.gather(
+        *(call(fn, args, kwargs, semaphore=semaphore) for args, kwargs in items),
+        return_exceptions=True,
+    )
+    return [
+        (False, result) if isinstance(result, Exception) else (True, result)
+        for result in results
+    ]
+
+
+class AsyncioPoolExecutor(cf.Executor):
+    """A `concurrent.futures` executor running coroutine functions in a single
+    event loop (in a background thread). At most `max_workers` of them run
+    concurrently."""
+
+    def __init__(self, max_workers=None):
+        self._max_workers = max_workers
+        self._shutdown = False
+        self._lock = threading.Lock()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run_loop, name="parallel-asyncio", daemon=True
+        )
+        self._thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        if self._max_workers:
+            # Created in the loop's thread, it's only used from there
+            _semaphores[self._loop] = asyncio.Semaphore(self._max_workers)
+        self._loop.run_forever()
+        self._loop.close()
+
+    async def _run(self, fn, args, kwargs):
+        # Runners (`run`, `timed`, `run_chunk`) take the semaphore per job
+        semaphore = None if fn in (run, timed, run_chunk) else _semaphore()
+        return await call(fn, args, kwargs, semaphore=semaphore)
+
+    def submit(self, fn, *args, **kwargs):
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            return asyncio.run_coroutine_threadsafe(
+                self._run(fn, args, kwargs), self._loop
+            )
+
+    async def _stop(self, cancel_futures):
+        current = current_task()
+        tasks = [
+            task for task in all_tasks() if task is not current and not task.done()
+        ]
+        if cancel_futures:
+            for task in tasks:
+                task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop.stop()
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+        # The loop stops by itself once pending coroutines are done
+        asyncio.run_coroutine_threadsafe(self._stop(cancel_futures), self._loop)
+        if wait:
+            self._thread.join()
+
+
+async def run_jobs(jobs, ResultClass, max_workers=None, timeout=None, silent=False):
+    semaphore = asyncio.Semaphore(max_workers) if max_workers else None
+    tasks = [
+        asyncio.ensure_future(call(job.fn, job.args, job.kwargs, semaphore=semaphore))
+        for job in jobs
+    ]
+    try:
+        outcomes = await asyncio.wait_for(
+            asyncio.gather(*tasks, return_exceptions=silent), timeout
+        )
+    except asyncio.TimeoutError as e:
+        raise exceptions.TimeoutException() from e
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    results = ResultClass()
+    for job, outcome in zip(jobs, outcomes):
+        if silent and isinstance(outcome, Exception):
+            outcome = FailedTask(job, outcome)
+        results.new_result(job.name, outcome)
+    return results
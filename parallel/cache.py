@@ -0,0 +1,182 @@
+"""Result caches for decorated functions (`parallel.decorate(cache=...)`).
+
+Results are cached by the job's callable and its normalized `(args,
+kwargs)`: in memory by the callable itself (see `job_key`), on disk by a
+digest of its name, code and closure (see `job_digest`). Only successful
+results are stored.
+"""
+import time
+import pickle
+import sqlite3
+import hashlib
+import threading
+import collections
+
+MISSING = object()
+
+
+def _digest(*values):
+    try:
+        payload = pickle.dumps(values, protocol=4)
+    except Exception:
+        return None
+    return hashlib.sha256(payload).hexdigest()
+
+
+def job_digest(job):
+    """A stable digest of the job, or `None` if its arguments (or the
+    variables its callable closes over) can't be serialized."""
+    fn = job.fn
+    name = (getattr(fn, "__module__", None), getattr(fn, "__qualname__", repr(fn)))
+    code = getattr(fn, "__code__", None)
+    try:
+        # Closures made by the same factory only differ in their variables
+        closure = tuple(cell.cell_contents for cell in getattr(fn, "__closure__", None) or ())
+    except ValueError:
+        # An empty cell
+        return None
+    return _digest(
+        name,
+        code.co_code if code is not None else None,
+        closure,
+        job.args,
+        sorted(job.kwargs.items()),
+    )
+
+
+def _typed(value):
+    # Types are part of the key, since ie: `1 == 1.0 == True` (also inside
+    # containers: `(1, 2) == (1.0, 2)`)
+    if isinstance(value, tuple):
+        return type(value), tuple(map(_typed, value))
+    if isinstance(value, frozenset):
+        return type(value), frozenset(map(_typed, value))
+    return type(value), value
+
+
+def job_key(job):
+    """A key identifying jobs with the same callable and arguments (to run
+    them only once). Unhashable arguments are replaced by their digest."""
+    try:
+        key = (
+            job.fn,
+            tuple(map(_typed, job.args)),
+            tuple(sorted((name, _typed(value)) for name, value in job.kwargs.items())),
+        )
+        hash(key)
+    except TypeError:
+        digest = _digest(job.args, sorted(job.kwargs.items()))
+        return None if digest is None else (job.fn, digest)
+    return key
+
+
+class MemoryCache:
+    """An in memory LRU cache of (up to) `maxsize` results, which expire
+    after `ttl` seconds."""
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=MISSING):
+        with self._lock:
+            try:
+                value, expires_at = self._data[key]
+            except KeyError:
+                return default
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while self.maxsize is not None and len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class DiskCache:
+    """A local on-disk cache (SQLite). Results expire after `ttl` seconds and
+    the least recently used ones are evicted when the pickled results exceed
+    `max_bytes`."""
+
+    def __init__(self, path, max_bytes=None, ttl=None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value BLOB, size INTEGER, "
+                "stored REAL, accessed REAL)"
+            )
+
+    def get(self, key, default=MISSING):
+        now = time.time()
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT value, stored FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return default
+            value, stored = row
+            if self.ttl is not None and now - stored >= self.ttl:
+                self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+                return default
+            self._db.execute(
+                "UPDATE results SET accessed = ? WHERE key = ?", (now, key)
+            )
+        return pickle.loads(value)
+
+    def set(self, key, value):
+        try:
+            value = pickle.dumps(value)
+        except Exception:
+            return
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now),
+            )
+            if self.max_bytes is not None:
+                self._evict()
+
+    def _evict(self):
+        total, = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()
+        rows = self._db.execute(
+            "SELECT key, size FROM results ORDER BY accessed"
+        ).fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self._db.executemany("DELETE FROM results WHERE key = ?", evicted)
+
+    def clear(self):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM results")
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,104 @@
+"""Checkpoints of a batch (`checkpoint="path"`), to resume it after a crash.
+
+The results of the completed jobs are appended to a local journal, keyed
+by the job's name (or its index). A rerun with the same checkpoint skips
+the jobs found in it; failed jobs aren't recorded, so they run again.
+"""
+import os
+import time
+import pickle
+
+from .cache import MISSING
+
+# Seconds between two writes (and fsyncs) of the journal
+DEFAULT_INTERVAL = 1.0
+
+
+class Checkpoint:
+    """A journal of `(key, result)` pickled records.
+
+    Records are buffered and written (and fsync'd) at most once every
+    `interval` seconds (also while waiting for jobs, see `flush_if_due`),
+    and when the batch finishes. A crash loses at most
+    the last `interval` seconds of results."""
+
+    def __init__(self, path, interval=DEFAULT_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self._results = {}
+        self._buffer = []
+        self._file = None
+        self._flushed_at = None
+
+    def open(self):
+        self._results = self._load()
+        self._file = open(self.path, "ab")
+        self._flushed_at = time.monotonic()
+
+    def _load(self):
+        results = {}
+        try:
+            fp = open(self.path, "r+b")
+        except FileNotFoundError:
+            return results
+        with fp:
+            offset = 0
+            while True:
+                try:
+                    key, result = pickle.load(fp)
+                except (EOFError, pickle.UnpicklingError):
+                    # The end of the journal, or a record cut short by a
+                    # crash (it's discarded)
+                    fp.truncate(offset)
+                    break
+                results[key] = result
+                offset = fp.tell()
+        return results
+
+    def __len__(self):
+        return len(self._results)
+
+    def __contains__(self, key):
+        return key in self._results
+
+    def get(self, key, default=MISSING):
+        return self._results.get(key, default)
+
+    def add(self, key, result):
+        if key in self._results:
+            # Restored from a previous run
+            return
+        try:
+            self._buffer.append(pickle.dumps((key, result), protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            # Unpicklable results run again on the next run
+            return
+        self.flush_if_due()
+
+    def flush_if_due(self):
+        """Flush if `interval` seconds passed since the last flush. Returns
+        the seconds until the next one is due (`None` if nothing is
+        buffered)."""
+        if not self._buffer:
+            return None
+        remaining = self._flushed_at + self.interval - time.monotonic()
+        if remaining <= 0:
+            self.flush()
+            return None
+        return remaining
+
+    def flush(self):
+        if self._buffer:
+            self._file.write(b"".join(self._buffer))
+            self._buffer = []
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._flushed_at = time.monotonic()
+
+    def close(self):
+        if self._file is None:
+            return
+        self.flush()
+        self._file.close()
+        self._file = None
+        self._results = {}
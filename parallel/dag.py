@@ -0,0 +1,137 @@
+"""Dependency graphs of jobs (`par(..., dag=True)`).
+
+Jobs built with `parallel.job` can receive other jobs of the graph as
+arguments (positional or named); they're replaced by their results. Each
+job is submitted as soon as its dependencies succeed, and fails (with a
+`DependencyException`) if any of them fails.
+"""
+import collections
+
+from . import exceptions
+from .models import ParallelJob, _UniversalParallelParametersCollection, _shared_kwargs
+
+
+class Graph:
+    """The jobs of a graph, iterated as `(index, job)` pairs as they get
+    ready to run (see `resolve`)."""
+
+    def __init__(self, params, extras=None, unpack_arguments=True):
+        self.jobs = []
+        indexes = {}
+        extras = _shared_kwargs(extras)
+        for index, (name, param) in enumerate(
+            _UniversalParallelParametersCollection(params).iter_params()
+        ):
+            if isinstance(param, ParallelJob):
+                indexes[id(param)] = index
+            self.jobs.append(
+                ParallelJob.normalize_job(name, param, extras, unpack_arguments)
+            )
+
+        self._dependencies = []
+        self._dependents = collections.defaultdict(list)
+        for index, job in enumerate(self.jobs):
+            dependencies = set()
+            for arg in [*job.args, *job.kwargs.values()]:
+                if not isinstance(arg, ParallelJob):
+                    continue
+                if id(arg) not in indexes:
+                    raise ValueError("{!r} depends on a job that isn't part of the graph".format(job))
+                dependencies.add(indexes[id(arg)])
+            self._dependencies.append(dependencies)
+            for dependency in dependencies:
+                self._dependents[dependency].append(index)
+        self._indexes = indexes
+        self._check_acyclic()
+
+        self._waiting = {
+            index: len(dependencies)
+            for index, dependencies in enumerate(self._dependencies)
+            if dependencies
+        }
+        self._ready = collections.deque(
+            index for index, dependencies in enumerate(self._dependencies)
+            if not dependencies
+        )
+        # Results of the jobs whose dependents haven't been submitted yet
+        self._results = {}
+        self._unsubmitted = {
+            index: len(dependents) for index, dependents in self._dependents.items()
+        }
+
+    def _check_acyclic(self):
+        remaining = [len(dependencies) for dependencies in self._dependencies]
+        ready = [index for index, count in enumerate(remaining) if not count]
+        visited = 0
+        while ready:
+            index = ready.pop()
+            visited += 1
+            for dependent in self._dependents[index]:
+                remaining[dependent] -= 1
+                if not remaining[dependent]:
+                    ready.append(dependent)
+        if visited != len(self.jobs):
+            raise ValueError("The jobs' dependencies have a cycle")
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self._ready:
+            # More jobs might get ready once the running ones are resolved
+            raise StopIteration
+        index = self._ready.popleft()
+        job = self.jobs[index]
+        if self._dependencies[index]:
+            job.args = tuple(self._substitute(arg) for arg in job.args)
+            job.kwargs = {name: self._substitute(arg) for name, arg in job.kwargs.items()}
+            for dependency in self._dependencies[index]:
+                self._unsubmitted[dependency] -= 1
+                if not self._unsubmitted[dependency]:
+                    del self._results[dependency]
+        return index, job
+
+    def _substitute(self, arg):
+        if not isinstance(arg, ParallelJob):
+            return arg
+        return self._results[self._indexes[id(arg)]]
+
+    def _key(self, index):
+        job = self.jobs[index]
+        return index if job.name is None else job.name
+
+    def resolve(self, index, outcome):
+        """Record the outcome of a job. Returns the `(index, job, outcome)`
+        of its dependents that failed because of it (if it failed)."""
+        succeeded, result = outcome
+        dependents = self._dependents.get(index, ())
+        if succeeded:
+            if dependents:
+                self._results[index] = result
+            for dependent in dependents:
+                self._waiting[dependent] -= 1
+                if not self._waiting[dependent]:
+                    del self._waiting[dependent]
+                    self._ready.append(dependent)
+            return []
+
+        failed = []
+        exc = exceptions.DependencyException(self._key(index), result)
+        for dependent in dependents:
+            if self._waiting.pop(dependent, None) is None:
+                # Already failed because of another dependency
+                continue
+            dependent_outcome = (False, exc)
+            failed.append((dependent, self.jobs[dependent], dependent_outcome))
+            failed.extend(self.resolve(dependent, dependent_outcome))
+        return failed
+
+    def cancel(self):
+        """Make the jobs still waiting for their dependencies ready, so the
+        executor reports them (ie: when the deadline expires)."""
+        self._ready.extend(sorted(self._waiting))
+        self._waiting.clear()
+        self._dependencies = [set() for _ in self.jobs]
@@ -3,4 +3,6 @@ DECORATED_PROCESS_FUNCTION = ("Decorated functions can't use Process executor."
 
 STATUS_EXECUTOR_NOT_STARTED = "Executor hasn't been started yet."
 
-STATUS_EXECUTOR_RUNNING = "Current executor is already executing (already started)"
\ No newline at end of file
+STATUS_EXECUTOR_RUNNING = "Current executor is already executing (already started)"
+
+STATUS_POOL_CLOSED = "Pool has been shut down and can't accept new jobs"
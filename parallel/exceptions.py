@@ -8,4 +8,19 @@ class TimeoutException(BaseParallelException):
 
 
 class ParallelStatusException(BaseParallelException):
-    pass
\ No newline at end of file
+    pass
+
+
+class CancelledException(BaseParallelException):
+    def __eq__(self, other):
+        return type(self) == type(other)
+
+
+class DependencyException(BaseParallelException):
+    """A job of a graph didn't run because one of its dependencies (`key`,
+    its name or index) failed with `exc`."""
+
+    def __init__(self, key, exc):
+        super().__init__(key, exc)
+        self.key = key
+        self.exc = exc
@@ -0,0 +1,70 @@
+"""Executor hooks, to observe (ie: trace) the lifecycle of a batch.
+
+Hooks are invoked from the thread consuming the results, never from the
+workers. Executors without hooks don't pay for them.
+"""
+
+
+class Hooks:
+    """Base class of executor hooks, every method is optional."""
+
+    def on_batch_start(self, executor):
+        pass
+
+    def on_submit(self, job):
+        pass
+
+    def on_start(self, job):
+        # Invoked once the worker reports the job, `job.started_at` has the
+        # time it actually started
+        pass
+
+    def on_complete(self, job, result):
+        pass
+
+    def on_error(self, job, exc):
+        pass
+
+    def on_batch_done(self, executor):
+        pass
+
+    def propagate(self, jobs):
+        """Return a (picklable) function creating a context manager that
+        wraps the call running `jobs` on the worker side, or `None`."""
+        return None
+
+
+class HookList(Hooks):
+    def __init__(self, hooks):
+        self.hooks = list(hooks)
+
+    def on_batch_start(self, executor):
+        for hook in self.hooks:
+            hook.on_batch_start(executor)
+
+    def on_submit(self, job):
+        for hook in self.hooks:
+            hook.on_submit(job)
+
+    def on_start(self, job):
+        for hook in self.hooks:
+            hook.on_start(job)
+
+    def on_complete(self, job, result):
+        for hook in self.hooks:
+            hook.on_complete(job, result)
+
+    def on_error(self, job, exc):
+        for hook in self.hooks:
+            hook.on_error(job, exc)
+
+    def on_batch_done(self, executor):
+        for hook in self.hooks:
+            hook.on_batch_done(executor)
+
+    def propagate(self, jobs):
+        for hook in self.hooks:
+            context = hook.propagate(jobs)
+            if context is not None:
+                return context
+        return None
@@ -1,6 +1,14 @@
 import enum
+import functools
+import math
+import array
+import itertools
+import threading
 import collections
 
+from . import utils
+from . import exceptions
+
 
 @enum.unique
 class ParallelStatus(enum.Enum):
@@ -10,6 +18,18 @@ class ParallelStatus(enum.Enum):
     FAILED = "FAILED"
 
 
+class CancellationToken:
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+
 class ParallelArg:
     def __init__(self, *args, **kwargs):
         self.args = args
@@ -21,24 +41,70 @@ class _UniversalParallelParametersCollection:
         self.params = params
 
     def iter_params(self):
-        if isinstance(self.params, collections.abc.Sequence):
-            yield from ((None, param) for param in self.params)
-        elif isinstance(self.params, dict):
+        if isinstance(self.params, collections.abc.Mapping):
             yield from self.params.items()
+        else:
+            # Any iterable, including generators and other lazy sources
+            yield from ((None, param) for param in self.params)
+
+
+class _SharedKwargs(dict):
+    """Named arguments shared by many jobs (ie: the `extras`), read-only
+    since changing them would change every job's."""
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("The kwargs are shared by other jobs, copy them to modify them")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        # A plain (not shared) dict once copied or sent to a worker
+        return dict, (dict(self),)
+
+
+# Shared by the jobs without named arguments
+_NO_KWARGS = _SharedKwargs()
+
+
+def _shared_kwargs(extras):
+    if not extras:
+        return _NO_KWARGS
+    if isinstance(extras, _SharedKwargs):
+        return extras
+    return _SharedKwargs(extras)
 
 
 class ParallelJob:
+    # Millions of jobs might be created by a single `map`
+    __slots__ = (
+        "fn", "name", "args", "kwargs", "status", "future", "_history",
+        "submitted_at", "started_at", "finished_at", "worker",
+    )
+
     def __init__(self, fn, name=None, args=None, kwargs=None):
         self.fn = fn
         self.name = name
         self.args = args
-        self.kwargs = kwargs or {}
+        self.kwargs = kwargs if kwargs is not None else _NO_KWARGS
         self.status = ParallelStatus.NOT_STARTED
+        # Only set while the job is in flight
         self.future = None
-        self._result = None
-        # Future versions:
-        # self.max_retries = -1 # math.inf
-        # self.results # (prev results or failed tasks)
+        self._history = None
+        # Timing of the last attempt (`time.time()`) and where it ran
+        self.submitted_at = None
+        self.started_at = None
+        self.finished_at = None
+        self.worker = None
+
+    @property
+    def history(self):
+        """Exceptions raised by previous (retried) attempts."""
+        if self._history is None:
+            self._history = []
+        return self._history
 
     def __eq__(self, other):
         return all(
@@ -55,17 +121,21 @@ class ParallelJob:
 
     @classmethod
     def normalize_params(cls, params, extras=None, unpack_arguments=True):
-        normalized_args = []
-        normalized_kwargs = (extras or {}).copy()
+        # Jobs without their own named arguments share `extras`
+        extras = _shared_kwargs(extras)
 
         if isinstance(params, ParallelArg):
-            return params.args, {**normalized_kwargs, **params.kwargs}
+            return params.args, {**extras, **params.kwargs}
         if not unpack_arguments:
-            return (params,), normalized_kwargs
+            return (params,), extras
         if isinstance(params, dict):
-            return tuple(), {**normalized_kwargs, **params}
-        if not any([isinstance(params, list), isinstance(params, tuple)]):
-            return (params,), normalized_kwargs
+            return tuple(), {**extras, **params}
+        if not isinstance(params, (list, tuple)):
+            return (params,), extras
+        if not any(isinstance(param, dict) for param in params):
+            return tuple(params), extras
+        normalized_args = []
+        normalized_kwargs = dict(extras)
         for param in params:
             if isinstance(param, dict):
                 normalized_kwargs.update(param)
@@ -90,22 +160,28 @@ class ParallelJob:
         (args, kwargs) = cls.normalize_params(args, extras, unpack_arguments)
         return cls(fn, name=name, args=args, kwargs=kwargs)
 
+    @classmethod
+    def iter_jobs_from_params(cls, params, extras=None, unpack_arguments=True):
+        params = _UniversalParallelParametersCollection(params)
+        extras = _shared_kwargs(extras)
+        for name, param in params.iter_params():
+            yield cls.normalize_job(name, param, extras, unpack_arguments)
+
     @classmethod
     def build_jobs_from_params(cls, params, extras=None, unpack_arguments=True):
-        params =_UniversalParallelParametersCollection(params)
-        return [cls.normalize_job(name, param, extras, unpack_arguments) for name, param in params.iter_params()]
+        return list(cls.iter_jobs_from_params(params, extras, unpack_arguments))
+
+    @classmethod
+    def iter_for_callable_from_params(cls, fn, params, extras=None, unpack_arguments=True):
+        params = _UniversalParallelParametersCollection(params)
+        extras = _shared_kwargs(extras)
+        for name, param in params.iter_params():
+            args, kwargs = cls.normalize_params(param, extras, unpack_arguments)
+            yield cls(fn, name, args, kwargs)
 
     @classmethod
     def build_for_callable_from_params(cls, fn, params, extras=None, unpack_arguments=True):
-        params =_UniversalParallelParametersCollection(params)
-        normalized = (
-            (name, cls.normalize_params(param, extras, unpack_arguments))
-            for name, param in params.iter_params()
-        )
-        return [
-            cls(fn, name=name, args=args, kwargs=kwargs)
-            for name, (args, kwargs) in normalized
-        ]
+        return list(cls.iter_for_callable_from_params(fn, params, extras, unpack_arguments))
 
 
 class FailedTask:
@@ -118,11 +194,28 @@ class FailedTask:
             return False
         return all([self.job == other.job, self.exc == other.exc])
 
+    @property
+    def history(self):
+        return self.job.history
+
+    @property
+    def attempts(self):
+        return len(self.job.history) + 1
+
+    @property
+    def timed_out(self):
+        return isinstance(self.exc, exceptions.TimeoutException)
+
     def __repr__(self):  # pragma: no cover
         return "FailedTask(job={}, exc={})".format(self.job, self.exc.__class__)
 
 
 class BaseResult:  # pragma: no cover
+    # `ExecutionStats` of the batch that produced these results
+    stats = None
+    # `ProfileReport`, with `profile=True`
+    profile = None
+
     def new_result(self, name, result):
         raise NotImplementedError()
 
@@ -142,46 +235,242 @@ class BaseResult:  # pragma: no cover
         raise NotImplementedError()
 
 
+def _invalidating(base, names):
+    """Wrap the mutators `names` of the builtin `base` so they drop the
+    tracked failures (they're recomputed when needed)."""
+
+    def wrap(method):
+        @functools.wraps(method)
+        def mutator(self, *args, **kwargs):
+            self._tracked = None
+            return method(self, *args, **kwargs)
+
+        return mutator
+
+    def decorator(cls):
+        for name in names:
+            if hasattr(base, name):
+                setattr(cls, name, wrap(getattr(base, name)))
+        return cls
+
+    return decorator
+
+
+@_invalidating(list, [
+    "__setitem__", "__delitem__", "__iadd__", "__imul__", "append", "extend",
+    "insert", "pop", "remove", "clear", "sort", "reverse",
+])
 class SequentialMapResult(BaseResult, list):
+    def __init__(self, *args):
+        super().__init__(*args)
+        # Indexes of the failed tasks, tracked as results are added (`None`
+        # after the list is modified otherwise)
+        self._tracked = None
+
+    @property
+    def _failed(self):
+        if self._tracked is None:
+            self._tracked = [i for i, obj in enumerate(self) if isinstance(obj, FailedTask)]
+        return self._tracked
+
     def new_result(self, name, result):
-        self.append(result)
+        if isinstance(result, FailedTask):
+            self._failed.append(len(self))
+        list.append(self, result)
 
     @property
     def failures(self):
-        return bool([obj for obj in self if isinstance(obj, FailedTask)])
+        return bool(self._failed)
 
     @property
     def succeeded(self):
-        return [obj for obj in self if not isinstance(obj, FailedTask)]
+        if not self._failed:
+            return list(self)
+        failed = set(self._failed)
+        return [obj for i, obj in enumerate(self) if i not in failed]
 
     @property
     def failed(self):
-        return [obj for obj in self if isinstance(obj, FailedTask)]
+        return [self[i] for i in self._failed]
 
     def replace_failed(self, replacement):
-        return [replacement if isinstance(obj, FailedTask) else obj for obj in self]
+        results = list(self)
+        for i in self._failed:
+            results[i] = replacement
+        return results
 
 
+@_invalidating(dict, [
+    "__setitem__", "__delitem__", "__ior__", "pop", "popitem", "setdefault",
+    "update", "clear",
+])
 class NamedMapResult(BaseResult, dict):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Names of the failed tasks, tracked as results are added (`None`
+        # after the dict is modified otherwise)
+        self._tracked = None
+
+    @property
+    def _failed(self):
+        if self._tracked is None:
+            self._tracked = [
+                name for name, obj in self.items() if isinstance(obj, FailedTask)
+            ]
+        return self._tracked
+
     def new_result(self, name, result):
-        self[name] = result
+        if name in self:
+            self._tracked = None
+        elif isinstance(result, FailedTask):
+            self._failed.append(name)
+        dict.__setitem__(self, name, result)
 
     @property
     def failures(self):
-        return bool([obj for obj in self.values() if isinstance(obj, FailedTask)])
+        return bool(self._failed)
 
     @property
     def succeeded(self):
-        return {
-            name: obj for name, obj in self.items() if not isinstance(obj, FailedTask)
-        }
+        if not self._failed:
+            return dict(self)
+        failed = set(self._failed)
+        return {name: obj for name, obj in self.items() if name not in failed}
 
     @property
     def failed(self):
-        return {name: obj for name, obj in self.items() if isinstance(obj, FailedTask)}
+        return {name: self[name] for name in self._failed}
 
     def replace_failed(self, replacement):
-        return {
-            name: (replacement if isinstance(obj, FailedTask) else obj)
-            for name, obj in self.items()
-        }
+        results = dict(self)
+        for name in self._failed:
+            results[name] = replacement
+        return results
+
+
+class ColumnarMapResult(BaseResult, collections.abc.Sequence):
+    """Sequential numeric results stored in an `array.array` (`typecode`
+    can also be a NumPy dtype), so they aren't boxed one by one.
+
+    Failed positions hold `fill` (NaN for floats, 0 otherwise) in `values`,
+    their `FailedTask`s are kept aside."""
+
+    def __init__(self, typecode="d", fill=None):
+        if len(str(typecode)) > 1 and utils.np is not None:
+            typecode = utils.np.dtype(typecode).char
+        self.values = array.array(typecode)
+        if fill is None:
+            fill = math.nan if typecode in "fd" else 0
+        self.fill = fill
+        self._failed = {}
+
+    def new_result(self, name, result):
+        if isinstance(result, FailedTask):
+            self._failed[len(self.values)] = result
+            result = self.fill
+        self.values.append(result)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        failed = self._failed.get(index)
+        return failed if failed is not None else self.values[index]
+
+    def __eq__(self, other):
+        if not isinstance(other, collections.abc.Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self):  # pragma: no cover
+        return "ColumnarMapResult({!r}, failed={})".format(self.values, len(self._failed))
+
+    @property
+    def failures(self):
+        return bool(self._failed)
+
+    @property
+    def succeeded(self):
+        if not self._failed:
+            return array.array(self.values.typecode, self.values)
+        return array.array(
+            self.values.typecode,
+            itertools.compress(self.values, (i not in self._failed for i in range(len(self)))),
+        )
+
+    @property
+    def failed(self):
+        return list(self._failed.values())
+
+    @property
+    def failed_indexes(self):
+        return list(self._failed)
+
+    def replace_failed(self, replacement):
+        values = array.array(self.values.typecode, self.values)
+        for i in self._failed:
+            values[i] = replacement
+        return values
+
+    def to_numpy(self):
+        """A NumPy array sharing the memory of `values` (failed positions
+        hold `fill`)."""
+        if utils.np is None:
+            raise ImportError("to_numpy() requires NumPy")
+        return utils.np.frombuffer(self.values, dtype=self.values.typecode)
+
+    def to_arrow(self):
+        """A PyArrow array, failed positions are null."""
+        import pyarrow
+
+        mask = None
+        if self._failed:
+            mask = utils.np.zeros(len(self), dtype=bool)
+            mask[list(self._failed)] = True
+        return pyarrow.array(self.to_numpy(), mask=mask)
+
+
+class SinkResult(BaseResult):
+    """Returned with a `sink`: results are written to it as they complete,
+    only their counts (and the failed tasks) are kept.
+
+    `succeeded` and `replace_failed` aren't available, the successful
+    results are only in the sink."""
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.written = 0
+        self._failed = {}
+
+    def new_result(self, name, result):
+        self.sink.write(name, result)
+        self.written += 1
+        if isinstance(result, FailedTask):
+            self._failed[name] = result
+
+    @property
+    def failed_count(self):
+        return len(self._failed)
+
+    @property
+    def failures(self):
+        return bool(self._failed)
+
+    @property
+    def failed(self):
+        """The failed tasks, by the key they were written with."""
+        return dict(self._failed)
+
+    @property
+    def succeeded(self):
+        raise TypeError("The successful results were written to the sink")
+
+    def replace_failed(self, replacement):
+        raise TypeError("The successful results were written to the sink")
+
+    def __repr__(self):  # pragma: no cover
+        return "SinkResult(written={}, failed={})".format(self.written, self.failed_count)
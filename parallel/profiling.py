@@ -0,0 +1,80 @@
+"""Worker side profiling (`profile=True`).
+
+Each call is profiled (with `cProfile`) where it runs, and the stats are
+merged in the parent into a single `pstats.Stats`.
+"""
+import pstats
+
+
+class _ProfileData:
+    # What `pstats.Stats` expects from a profiler
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+class ProfileReport:
+    """Merged profile of the jobs of one (or more) batches.
+
+    Besides `stats` (a `pstats.Stats`), the time of the calls is split in:
+
+    * `user_time`: running the jobs' functions.
+    * `library_time`: dispatching jobs inside the workers (ie: unpacking
+      chunks, looking up registered callables).
+    * `dispatch_time`: from submission until the worker started the call
+      (waiting for a free worker, serializing and sending the arguments).
+    * `return_time`: from the end of the call until the parent got the
+      result (serializing and sending it back).
+    """
+
+    def __init__(self):
+        self.stats = None
+        self.calls = 0
+        self.user_time = 0.0
+        self.library_time = 0.0
+        self.dispatch_time = 0.0
+        self.return_time = 0.0
+
+    def add_call(self, submitted, call, done, user_time):
+        started, finished, profile_stats = call
+        self.calls += 1
+        self.user_time += user_time
+        self.library_time += max(finished - started - user_time, 0)
+        self.dispatch_time += max(started - submitted, 0)
+        if done is not None:
+            self.return_time += max(done - finished, 0)
+        if profile_stats is not None:
+            self.add_stats(profile_stats)
+
+    def add_stats(self, profile_stats):
+        data = _ProfileData(profile_stats)
+        if self.stats is None:
+            self.stats = pstats.Stats(data)
+        else:
+            self.stats.add(data)
+
+    @property
+    def breakdown(self):
+        return {
+            "user": self.user_time,
+            "library": self.library_time,
+            "dispatch": self.dispatch_time,
+            "return": self.return_time,
+        }
+
+    def print_stats(self, *restrictions, sort="cumulative"):
+        print(
+            "{} calls: user {user:.3f}s, library {library:.3f}s, "
+            "dispatch {dispatch:.3f}s, return {return:.3f}s".format(
+                self.calls, **self.breakdown
+            )
+        )
+        if self.stats is not None:
+            self.stats.sort_stats(sort).print_stats(*restrictions)
+
+    def dump_stats(self, path):
+        """Write the merged stats, to be read with `pstats` or other tools
+        (ie: snakeviz)."""
+        self.stats.dump_stats(path)
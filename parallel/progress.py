@@ -0,0 +1,110 @@
+"""Progress reporting (`progress=True` or `progress=callback`)."""
+import sys
+import time
+import threading
+import collections
+
+# Minimum seconds between two reports, so tight loops aren't slowed down
+DEFAULT_INTERVAL = 0.1
+
+
+class ProgressReport(
+    collections.namedtuple(
+        "ProgressReport", ["completed", "failed", "total", "elapsed", "final"]
+    )
+):
+    """`completed` includes the `failed` jobs. `total` is `None` when the
+    jobs come from an iterable without length. `final` is set on the last
+    report of the batch (even if it stopped early)."""
+
+    __slots__ = ()
+
+    @property
+    def rate(self):
+        """Completed jobs per second."""
+        if self.elapsed <= 0:
+            return None
+        return self.completed / self.elapsed
+
+    @property
+    def eta(self):
+        """Estimated seconds until all the jobs complete."""
+        if self.total is None or not self.rate:
+            return None
+        return (self.total - self.completed) / self.rate
+
+    @property
+    def finished(self):
+        return self.final or (self.total is not None and self.completed >= self.total)
+
+
+def print_progress(report, file=None):
+    file = file or sys.stderr
+    total = "?" if report.total is None else report.total
+    rate = "?" if report.rate is None else "{:.1f}".format(report.rate)
+    eta = "?" if report.eta is None else "{:.0f}s".format(report.eta)
+    file.write("\r{}/{} ({} failed) {} jobs/s, ETA {}".format(
+        report.completed, total, report.failed, rate, eta))
+    if report.finished:
+        file.write("\n")
+    file.flush()
+
+
+class Progress:
+    """Counts completed jobs and invokes `callback(report)` at most once per
+    `interval` seconds (and once more when all the jobs completed).
+
+    Updates come from future callbacks, so `callback` runs in a worker (or
+    the executor's management) thread."""
+
+    def __init__(self, callback=None, interval=DEFAULT_INTERVAL):
+        self.callback = callback or print_progress
+        self.interval = interval
+        self.total = None
+        self.completed = 0
+        self.failed = 0
+        self._started = None
+        self._last_report = None
+        self._reported = None
+        self._lock = threading.Lock()
+
+    def start(self, total=None):
+        with self._lock:
+            self.total = total
+            self.completed = self.failed = 0
+            self._started = time.monotonic()
+            self._last_report = self._reported = None
+
+    def report(self, final=False):
+        return ProgressReport(
+            self.completed,
+            self.failed,
+            self.total,
+            time.monotonic() - self._started,
+            final,
+        )
+
+    def update(self, completed, failed=0):
+        with self._lock:
+            self.completed += completed
+            self.failed += failed
+            now = time.monotonic()
+            report = self.report()
+            due = (
+                self._last_report is None
+                or now - self._last_report >= self.interval
+                or report.finished
+            )
+            if not due:
+                return
+            self._last_report = now
+            self._reported = report
+        self.callback(report)
+
+    def finish(self):
+        """Send the final report, unless the last one was already final."""
+        with self._lock:
+            if self._reported is not None and self._reported.finished:
+                return
+            self._reported = report = self.report(final=True)
+        self.callback(report)
@@ -0,0 +1,145 @@
+"""Shared memory transport for NumPy arrays.
+
+The parent copies the array once into a shared memory block and workers
+receive small `SharedArray` descriptors (name, offset, shape, dtype) instead
+of pickled copies of their chunk. Results with the same shape and dtype are
+written back into a preallocated shared output block. Functions must return
+the result of their part (returning `None` is an error, modifying the part
+in place doesn't produce results).
+"""
+from .utils import np
+from .models import ParallelJob
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # pragma: no cover
+    shared_memory = None
+
+SHARED_MEMORY = "shared_memory"
+
+
+class Written:
+    """Returned by `run_chunk` when the result was written to the output
+    block (instead of `None`, which the function might return)."""
+
+
+class SharedArray:
+    def __init__(self, name, offset, shape, dtype):
+        self.name = name
+        self.offset = offset
+        self.shape = shape
+        self.dtype = dtype
+
+    def __repr__(self):  # pragma: no cover
+        return "SharedArray({}, offset={}, shape={}, dtype={})".format(
+            self.name, self.offset, self.shape, self.dtype)
+
+    def slice(self, beginning, end):
+        row_size = np.dtype(self.dtype).itemsize
+        for dimension in self.shape[1:]:
+            row_size *= dimension
+        return SharedArray(
+            self.name,
+            self.offset + beginning * row_size,
+            (end - beginning,) + tuple(self.shape[1:]),
+            self.dtype,
+        )
+
+    def view(self, block):
+        return np.ndarray(
+            self.shape, dtype=self.dtype, buffer=block.buf, offset=self.offset)
+
+
+def check_available():
+    if np is None or shared_memory is None:
+        raise ImportError(
+            "The shared memory transport requires NumPy and Python 3.8+")
+
+
+def allocate(shape, dtype):
+    dtype = np.dtype(dtype)
+    size = max(int(np.prod(shape)) * dtype.itemsize, 1)
+    block = shared_memory.SharedMemory(create=True, size=size)
+    return block, SharedArray(block.name, 0, tuple(shape), dtype.str)
+
+
+def publish(array):
+    array = np.ascontiguousarray(array)
+    block, descriptor = allocate(array.shape, array.dtype)
+    descriptor.view(block)[...] = array
+    return block, descriptor
+
+
+def _close(block):
+    try:
+        block.close()
+    except BufferError:  # pragma: no cover
+        # Some view is still alive (ie: referenced by a traceback), the
+        # mapping will be released once it's garbage collected
+        pass
+
+
+def release(*blocks):
+    for block in blocks:
+        _close(block)
+        block.unlink()
+
+
+def run_chunk(fn, source, output, extras):
+    source_block = shared_memory.SharedMemory(name=source.name)
+    output_block = shared_memory.SharedMemory(name=output.name)
+    try:
+        result = fn(source.view(source_block), **extras)
+        if result is None:
+            raise TypeError(
+                "Functions split with the shared memory transport must return "
+                "the result of their part, {!r} returned None".format(fn)
+            )
+        out = output.view(output_block)
+        if (
+            isinstance(result, np.ndarray)
+            and result.shape == out.shape
+            and result.dtype == out.dtype
+        ):
+            out[...] = result
+            result = Written()
+        elif isinstance(result, np.ndarray):
+            # Might be a view of the shared block, which is about to be closed
+            result = result.copy()
+        del out
+        return result
+    finally:
+        _close(source_block)
+        _close(output_block)
+
+
+def map_partitions(execute, array, fn, bounds, extras=None):
+    """Apply `fn` to the `(beginning, end)` row `bounds` of `array`.
+
+    `execute` receives the list of jobs to run and returns their results.
+    """
+    check_available()
+    source_block, source = publish(array)
+    output_block, output = allocate(source.shape, source.dtype)
+    try:
+        jobs = [
+            ParallelJob(
+                run_chunk,
+                None,
+                [fn, source.slice(b, e), output.slice(b, e), extras or {}],
+            )
+            for b, e in bounds
+        ]
+        results = execute(jobs)
+        out = output.view(output_block)
+        if all(isinstance(result, Written) for result in results):
+            merged = [np.array(out)]
+        else:
+            merged = [
+                np.array(out[b:e]) if isinstance(result, Written) else result
+                for (b, e), result in zip(bounds, results)
+            ]
+        del out
+        return merged
+    finally:
+        release(source_block, output_block)
@@ -0,0 +1,170 @@
+"""Result sinks (`sink=`), to write results as jobs complete instead of
+keeping them in memory.
+
+Results are written in completion order, tagged with the job's key (its
+index, or its name for named params). Failed jobs (with `silent=True`) are
+written as their `FailedTask`, file sinks store their exception.
+"""
+import os
+import json
+import pickle
+
+from .models import FailedTask
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+
+class Sink:
+    """Base class of result sinks. `write` is invoked from the thread
+    consuming the results, so the jobs' submission waits for it."""
+
+    def open(self):
+        pass
+
+    def write(self, key, result):
+        raise NotImplementedError()
+
+    def close(self):
+        pass
+
+
+class CallableSink(Sink):
+    def __init__(self, fn):
+        self.fn = fn
+
+    def write(self, key, result):
+        self.fn(key, result)
+
+
+class FileSink(Sink):
+    mode = "w"
+
+    def __init__(self, path, append=False):
+        self.path = path
+        self.append = append
+        self._file = None
+
+    def open(self):
+        mode = self.mode.replace("w", "a") if self.append else self.mode
+        self._file = open(self.path, mode)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class JSONLinesSink(FileSink):
+    """One JSON object per line: `{"key": ..., "result": ...}`, or
+    `{"key": ..., "error": "<repr of the exception>"}` for failures.
+    `default` is passed to `json.dumps`."""
+
+    def __init__(self, path, append=False, default=None):
+        super().__init__(path, append=append)
+        self.default = default
+
+    def write(self, key, result):
+        if isinstance(result, FailedTask):
+            record = {"key": key, "error": repr(result.exc)}
+        else:
+            record = {"key": key, "result": result}
+        self._file.write(json.dumps(record, default=self.default) + "\n")
+
+
+class PickleSink(FileSink):
+    """A stream of pickled `(key, succeeded, result_or_exception)` records,
+    read back with `PickleSink.load(path)`."""
+
+    mode = "wb"
+
+    def write(self, key, result):
+        if isinstance(result, FailedTask):
+            record = (key, False, result.exc)
+        else:
+            record = (key, True, result)
+        pickle.dump(record, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(path):
+        with open(path, "rb") as fp:
+            while True:
+                try:
+                    yield pickle.load(fp)
+                except EOFError:
+                    return
+
+
+class ParquetSink(Sink):
+    """A Parquet file with `key`, `result` and `error` columns (requires
+    `pyarrow`). Rows are written in groups of `batch_size`, results must be
+    values Arrow can store (the schema comes from the first group)."""
+
+    def __init__(self, path, batch_size=1024):
+        if pyarrow is None:
+            raise ImportError("ParquetSink requires the `pyarrow` package")
+        self.path = path
+        self.batch_size = batch_size
+        self._writer = None
+        self._rows = None
+
+    def open(self):
+        self._rows = {"key": [], "result": [], "error": []}
+
+    def write(self, key, result):
+        failed = isinstance(result, FailedTask)
+        self._rows["key"].append(key)
+        self._rows["result"].append(None if failed else result)
+        self._rows["error"].append(repr(result.exc) if failed else None)
+        if len(self._rows["key"]) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._rows["key"]:
+            return
+        if self._writer is None:
+            table = pyarrow.table(self._rows)
+            # The first group might be all failures (or successes)
+            schema = table.schema.set(
+                2, pyarrow.field("error", pyarrow.string())
+            )
+            if pyarrow.types.is_null(schema.field("result").type):
+                schema = schema.set(1, pyarrow.field("result", pyarrow.string()))
+            self._writer = pyarrow.parquet.ParquetWriter(self.path, schema)
+        self._writer.write_table(pyarrow.table(self._rows, schema=self._writer.schema))
+        self._rows = {"key": [], "result": [], "error": []}
+
+    def close(self):
+        if self._rows is not None:
+            self._flush()
+            self._rows = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+SINKS_BY_EXTENSION = {
+    ".jsonl": JSONLinesSink,
+    ".ndjson": JSONLinesSink,
+    ".pkl": PickleSink,
+    ".pickle": PickleSink,
+    ".parquet": ParquetSink,
+}
+
+
+def get_sink(sink):
+    """A `Sink` from a `Sink`, a `(key, result)` callable or a path (whose
+    extension picks the format)."""
+    if sink is None or isinstance(sink, Sink):
+        return sink
+    if isinstance(sink, (str, os.PathLike)):
+        extension = os.path.splitext(os.fspath(sink))[1].lower()
+        if extension not in SINKS_BY_EXTENSION:
+            raise ValueError("Unknown sink format: {}".format(sink))
+        return SINKS_BY_EXTENSION[extension](sink)
+    if callable(sink):
+        return CallableSink(sink)
+    raise TypeError("Invalid sink: {!r}".format(sink))
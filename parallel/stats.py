@@ -0,0 +1,124 @@
+"""Execution statistics of a batch, built from the timing of its jobs."""
+import math
+import collections
+
+# A job is a straggler if it ran for more than this many times the median
+STRAGGLER_FACTOR = 3
+
+
+class JobRecord(
+    collections.namedtuple(
+        "JobRecord", ["key", "submitted", "started", "finished", "worker"]
+    )
+):
+    __slots__ = ()
+
+    @property
+    def queue_wait(self):
+        return self.started - self.submitted
+
+    @property
+    def run_time(self):
+        return self.finished - self.started
+
+
+def percentile(values, q):
+    """Nearest-rank percentile (`q` between 0 and 100) of sorted `values`."""
+    if not values:
+        return None
+    rank = max(math.ceil(q / 100 * len(values)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+def summarize(values):
+    values = sorted(values)
+    if not values:
+        return {}
+    return {
+        "mean": sum(values) / len(values),
+        "p50": percentile(values, 50),
+        "p90": percentile(values, 90),
+        "p99": percentile(values, 99),
+        "max": values[-1],
+    }
+
+
+class ExecutionStats:
+    """Timing of a finished (or running) batch.
+
+    `rows` are the `(key, submitted, started, finished, worker)` tuples of
+    the jobs that completed, times are seconds since the epoch
+    (`time.time()`), so they're comparable across processes. `workers` is
+    the size of the pool, if known.
+    """
+
+    def __init__(self, rows, started, finished, workers=None):
+        self._rows = list(rows)
+        self._records = None
+        self.started = started
+        self.finished = finished
+        self._workers = workers
+
+    @property
+    def records(self):
+        """`JobRecord`s of the completed jobs (built on first access)."""
+        if self._records is None:
+            self._records = [JobRecord._make(row) for row in self._rows]
+        return self._records
+
+    @property
+    def jobs(self):
+        return len(self._rows)
+
+    @property
+    def wall_time(self):
+        return self.finished - self.started
+
+    @property
+    def queue_wait(self):
+        return summarize(record.queue_wait for record in self.records)
+
+    @property
+    def run_time(self):
+        return summarize(record.run_time for record in self.records)
+
+    @property
+    def throughput(self):
+        """Completed jobs per second."""
+        if self.wall_time <= 0:
+            return None
+        return self.jobs / self.wall_time
+
+    @property
+    def busy_time(self):
+        """Seconds each worker spent running jobs."""
+        busy = collections.defaultdict(float)
+        for record in self.records:
+            busy[record.worker] += record.run_time
+        return dict(busy)
+
+    @property
+    def utilization(self):
+        """Fraction of the available worker time spent running jobs."""
+        busy = self.busy_time
+        workers = self._workers or len(busy)
+        if not workers or self.wall_time <= 0:
+            return None
+        return min(sum(busy.values()) / (workers * self.wall_time), 1.0)
+
+    @property
+    def stragglers(self):
+        """Records of the jobs that took `STRAGGLER_FACTOR` times longer than
+        the median, slowest first."""
+        median = self.run_time.get("p50")
+        if not median:
+            return []
+        return sorted(
+            (r for r in self.records if r.run_time > median * STRAGGLER_FACTOR),
+            key=lambda record: record.run_time,
+            reverse=True,
+        )
+
+    def __repr__(self):  # pragma: no cover
+        return "ExecutionStats(jobs={}, wall_time={:.3f}s, utilization={})".format(
+            self.jobs, self.wall_time, self.utilization)
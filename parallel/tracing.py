@@ -0,0 +1,123 @@
+"""OpenTelemetry spans for parallel batches (requires `opentelemetry-api`).
+
+Each batch gets a `parallel.batch` span, with a `parallel.job` child span
+per job. The span of the job (or the batch, for chunks) is the current one
+while the job runs, even in threads and worker processes, so spans created
+by the job are nested under it.
+"""
+import threading
+import contextlib
+import functools
+
+from .hooks import Hooks
+
+try:
+    from opentelemetry import context, propagate, trace
+except ImportError:  # pragma: no cover
+    trace = None
+
+
+def check_available():
+    if trace is None:
+        raise ImportError("Tracing requires the `opentelemetry-api` package")
+
+
+def _nanoseconds(seconds):
+    return int(seconds * 1e9)
+
+
+@contextlib.contextmanager
+def activate(carrier):
+    """Make the span propagated in `carrier` the current one (worker side)."""
+    token = context.attach(propagate.extract(carrier))
+    try:
+        yield
+    finally:
+        context.detach(token)
+
+
+class TracingHooks(Hooks):
+    def __init__(self, tracer=None):
+        check_available()
+        self.tracer = tracer or trace.get_tracer("parallel")
+        self._lock = threading.Lock()
+        self._batches = {}
+        self._spans = {}
+
+    def on_batch_start(self, executor):
+        span = self.tracer.start_span(
+            "parallel.batch",
+            attributes={"parallel.executor": type(executor).__name__},
+        )
+        token = context.attach(trace.set_span_in_context(span))
+        with self._lock:
+            self._batches[id(executor)] = (span, token)
+
+    def on_submit(self, job):
+        span = self.tracer.start_span(
+            "parallel.job", start_time=_nanoseconds(job.submitted_at)
+        )
+        if job.name is not None:
+            span.set_attribute("parallel.job.name", str(job.name))
+        batch = trace.get_current_span()
+        with self._lock:
+            previous, _ = self._spans.pop(id(job), (None, None))
+            self._spans[id(job)] = (span, batch)
+        if previous is not None:
+            # The job is being retried
+            previous.add_event("retry", {"parallel.job.attempt": len(job.history)})
+            previous.end(end_time=_nanoseconds(job.submitted_at))
+
+    def _finish(self, job):
+        with self._lock:
+            span, _ = self._spans.pop(id(job), (None, None))
+        if span is not None and job.finished_at is not None:
+            span.set_attribute("parallel.worker", job.worker)
+            span.set_attribute("parallel.queue_wait", job.started_at - job.submitted_at)
+            span.set_attribute("parallel.run_time", job.finished_at - job.started_at)
+        return span
+
+    def on_complete(self, job, result):
+        span = self._finish(job)
+        if span is not None:
+            span.end(end_time=job.finished_at and _nanoseconds(job.finished_at))
+
+    def on_error(self, job, exc):
+        span = self._finish(job)
+        if span is not None:
+            span.record_exception(exc)
+            span.set_status(trace.Status(trace.StatusCode.ERROR, str(exc)))
+            span.end(end_time=job.finished_at and _nanoseconds(job.finished_at))
+
+    def on_batch_done(self, executor):
+        with self._lock:
+            span, token = self._batches.pop(id(executor), (None, None))
+        if span is None:
+            return
+        context.detach(token)
+        with self._lock:
+            # Jobs cancelled (or never resolved) when the batch failed
+            unfinished = [
+                key for key, (_, batch) in self._spans.items() if batch is span
+            ]
+            unfinished = [self._spans.pop(key)[0] for key in unfinished]
+        for job_span in unfinished:
+            job_span.set_status(trace.Status(trace.StatusCode.ERROR, "cancelled"))
+            job_span.end()
+        stats = executor.stats
+        if stats is not None:
+            span.set_attribute("parallel.jobs", stats.jobs)
+            if stats.utilization is not None:
+                span.set_attribute("parallel.utilization", stats.utilization)
+        span.end()
+
+    def propagate(self, jobs):
+        if len(jobs) == 1:
+            with self._lock:
+                span, _ = self._spans.get(id(jobs[0]), (None, None))
+            ctx = trace.set_span_in_context(span) if span is not None else None
+        else:
+            ctx = None
+        carrier = {}
+        propagate.inject(carrier, context=ctx)
+        return functools.partial(activate, carrier)
@@ -1,14 +1,206 @@
-def split_collection(collection, chunks):
-    if type(collection) not in (list, tuple):
-        raise ValueError("This is an experimental feature, only list and tuples are supported.")
-
-    is_odd = (len(collection) % chunks) != 0
-    k = int(len(collection) / chunks)
-    if is_odd:
-        k += 1
+import os
+import math
+import bisect
+import itertools
+import collections
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+from . import worker
+
+# Workers shared by the whole process (nested parallel calls included),
+# the CPUs unless it's set with `set_concurrency_budget`
+_concurrency_budget = None
+
+
+def set_concurrency_budget(workers):
+    global _concurrency_budget
+    _concurrency_budget = workers
+
+
+def concurrency_budget():
+    """Workers the parallel calls of the current thread may use: the share
+    of the job running in it, or the budget of the whole process."""
+    nested = worker.budget()
+    if nested is not None:
+        return nested
+    return _concurrency_budget or os.cpu_count() or 1
+
+
+def nested_budget(workers):
+    # Each of the `workers` gets an even share, so nested calls don't
+    # oversubscribe the CPUs
+    return max(1, concurrency_budget() // workers)
+
+
+def default_max_workers():
+    # Nested calls (in a job) are limited to their share of the budget
+    nested = worker.budget()
+    if nested is not None:
+        return nested
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def auto_chunksize(params, workers):
+    # Similar to multiprocessing.Pool.map: ~4 chunks per worker, so chunks are
+    # big enough to amortize IPC but there's still some room for balancing
+    if not isinstance(params, collections.abc.Sized):
+        return 1
+    return max(1, math.ceil(len(params) / (workers * 4)))
+
+
+CONTIGUOUS = "contiguous"
+ROUND_ROBIN = "round_robin"
+SIZE_WEIGHTED = "size_weighted"
+GUIDED = "guided"
+
+SPLIT_STRATEGIES = (CONTIGUOUS, ROUND_ROBIN, SIZE_WEIGHTED, GUIDED)
+
+
+def _is_sliceable(collection):
+    # Lists, tuples, ranges, memoryviews, NumPy arrays, etc.
+    return (
+        isinstance(collection, collections.abc.Sized)
+        and hasattr(collection, "__getitem__")
+        and not isinstance(collection, collections.abc.Mapping)
+    )
+
+
+def _iter_fixed_size_chunks(iterable, chunk_size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _contiguous_boundaries(length, chunks):
+    # Sizes differ at most by one (bigger chunks first), no empty chunks
+    k, remainder = divmod(length, chunks)
+    beginning = 0
     for i in range(chunks):
-        beginning = i * k
-        end = k * (i + 1)
-        # if is_odd and i == 0:
-        #     end += 1
-        yield collection[beginning: end]
\ No newline at end of file
+        end = beginning + k + (1 if i < remainder else 0)
+        yield beginning, end
+        beginning = end
+
+
+def _weighted_boundaries(collection, chunks, weight):
+    cumulative = list(itertools.accumulate(weight(item) for item in collection))
+    total = cumulative[-1] if cumulative else 0
+    beginning = 0
+    for i in range(1, chunks):
+        # Leave at least one item for each of the remaining chunks
+        lowest, highest = beginning + 1, len(collection) - (chunks - i)
+        end = bisect.bisect_left(cumulative, total * i / chunks) + 1
+        end = min(max(end, lowest), highest)
+        yield beginning, end
+        beginning = end
+    yield beginning, len(collection)
+
+
+def guided_chunksize(remaining, workers, minimum=1):
+    # Guided self-scheduling: each chunk takes 1/workers of the remaining
+    # items, so chunks shrink as the queue drains
+    return max(minimum, math.ceil(remaining / workers))
+
+
+def _guided_boundaries(length, workers, minimum=1):
+    beginning = 0
+    while beginning < length:
+        end = beginning + guided_chunksize(length - beginning, workers, minimum)
+        yield beginning, min(end, length)
+        beginning = end
+
+
+def split_bounds(collection, chunks=None, strategy=CONTIGUOUS, chunk_size=None, weight=len):
+    """Return the `(beginning, end)` boundaries of the consecutive parts of
+    a sized `collection` (`contiguous`, `size_weighted` and `guided`
+    strategies).
+
+    For `guided`, `chunks` is the number of workers and `chunk_size` the
+    minimum size of a part."""
+    length = len(collection)
+    if not length:
+        return []
+    if strategy == GUIDED:
+        return list(_guided_boundaries(length, chunks or 1, chunk_size or 1))
+    if chunk_size:
+        chunks = math.ceil(length / chunk_size)
+    chunks = min(chunks or 1, length)
+
+    if strategy == SIZE_WEIGHTED:
+        return list(_weighted_boundaries(collection, chunks, weight))
+    return list(_contiguous_boundaries(length, chunks))
+
+
+def split_collection(
+    collection, chunks=None, strategy=CONTIGUOUS, chunk_size=None, weight=len
+):
+    """Partition `collection` in `chunks` parts (or parts of `chunk_size`).
+
+    Strategies:
+    * `contiguous`: consecutive slices of (almost) the same size.
+    * `round_robin`: item `i` goes to chunk `i % chunks`.
+    * `size_weighted`: consecutive slices with (almost) the same total
+      `weight(item)`.
+    * `guided`: consecutive slices of decreasing size, see `split_bounds`.
+
+    Sliceable collections are sliced, so chunks keep their type (and NumPy
+    arrays or memoryviews aren't copied). Other iterables are consumed lazily
+    when `chunk_size` is given, or materialized into a list otherwise.
+    """
+    if strategy not in SPLIT_STRATEGIES:
+        raise ValueError("Invalid split strategy {!r}, use one of {}".format(
+            strategy, ", ".join(SPLIT_STRATEGIES)))
+    if isinstance(collection, collections.abc.Mapping):
+        raise ValueError("Mappings can't be split, pass a sequence instead.")
+
+    if not _is_sliceable(collection):
+        if chunk_size and strategy == CONTIGUOUS:
+            yield from _iter_fixed_size_chunks(collection, chunk_size)
+            return
+        collection = list(collection)
+
+    if strategy == ROUND_ROBIN:
+        length = len(collection)
+        if chunk_size:
+            chunks = math.ceil(length / chunk_size)
+        chunks = min(chunks or 1, length)
+        for i in range(chunks):
+            yield collection[i::chunks]
+        return
+
+    bounds = split_bounds(collection, chunks, strategy, chunk_size, weight)
+    for beginning, end in bounds:
+        yield collection[beginning:end]
+
+
+def merge_chunks(results, strategy=CONTIGUOUS):
+    """Reassemble the results of the chunks produced by `split_collection`,
+    in the order of the original collection."""
+    results = list(results)
+    if not results:
+        return []
+
+    if np is not None and all(isinstance(r, np.ndarray) for r in results):
+        if strategy != ROUND_ROBIN:
+            return np.concatenate(results)
+        merged = np.empty(
+            (sum(len(r) for r in results),) + results[0].shape[1:],
+            dtype=np.result_type(*results))
+    elif strategy == ROUND_ROBIN:
+        merged = [None] * sum(len(r) for r in results)
+    else:
+        merged = []
+        for result in results:
+            merged.extend(result)
+        return merged
+
+    step = len(results)
+    for i, result in enumerate(results):
+        merged[i::step] = result
+    return merged
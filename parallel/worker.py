@@ -0,0 +1,188 @@
+"""Functions executed on the worker side (threads or processes).
+
+Everything here must be importable (and picklable by reference) from a
+freshly spawned interpreter.
+"""
+import os
+import time
+import cProfile
+import threading
+
+from . import exceptions
+
+_local = threading.local()
+
+
+def cancelled():
+    """`True` if the batch of the job running in the current thread has been
+    cancelled (ie: another job failed). Long running jobs can poll it to
+    stop early."""
+    token = getattr(_local, "token", None)
+    return token is not None and token.cancelled
+
+
+def run_with_token(token, fn, args, kwargs):
+    previous = getattr(_local, "token", None)
+    _local.token = token
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _local.token = previous
+
+
+def budget():
+    """Workers available to the parallel calls nested in the job running in
+    the current thread, `None` outside of jobs."""
+    return getattr(_local, "budget", None)
+
+
+# Read by BLAS/OpenMP runtimes to size their thread pools
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+
+def limit_threads(budget):
+    """Cap the threads of BLAS/OpenMP runtimes of this (worker) process,
+    unless they're set already."""
+    for name in THREAD_ENV_VARS:
+        os.environ.setdefault(name, str(budget))
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+    # Runtimes loaded before the env vars were set (ie: forked workers)
+    threadpool_limits(budget)
+
+
+# Whether this process already capped its threads (see `run_limited`)
+_limited = False
+
+
+def run_limited(budget, fn, args, kwargs):
+    """Cap the threads of this process on its first call, for pools without
+    initializers (Python 3.6)."""
+    global _limited
+    if not _limited:
+        limit_threads(budget)
+        _limited = True
+    return fn(*args, **kwargs)
+
+
+def initialize(budget, token=None, fn=None, extras=None):
+    """Initializer of the worker processes."""
+    limit_threads(budget)
+    if token is not None:
+        register(token, fn, extras)
+
+
+def worker_id():
+    return "{}:{}".format(os.getpid(), threading.current_thread().name)
+
+
+def _start_profiler():
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:  # pragma: no cover
+        # Another profiler is active (ie: in other thread, Python 3.12+)
+        return None
+    return profiler
+
+
+def _profile_stats(profiler):
+    if profiler is None:
+        return None
+    profiler.create_stats()
+    return profiler.stats
+
+
+def run(fn, args, kwargs, budget=None):
+    """Run `fn` with the `budget` of its nested calls (see `budget()`), the
+    untimed counterpart of `timed`."""
+    previous = getattr(_local, "budget", None)
+    _local.budget = budget
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _local.budget = previous
+
+
+def timed(fn, args, kwargs, context=None, profile=False, budget=None):
+    """Run `fn` recording when and where it ran.
+
+    Returns `(succeeded, result_or_exception, worker_id, timings, call)`,
+    where `timings` has a `(started, finished)` pair per job (chunks record
+    their items separately) and `call` is the `(started, finished,
+    profile_stats)` of the whole call (stats only with `profile`).
+    `context` creates a context manager wrapping the call (see
+    `Hooks.propagate`). `budget` is the number of workers of the parallel
+    calls nested in the job (see `budget()`)."""
+    if context is not None:
+        with context():
+            return timed(fn, args, kwargs, profile=profile, budget=budget)
+    profiler = _start_profiler() if profile else None
+    previous = getattr(_local, "timings", None), getattr(_local, "budget", None)
+    timings = _local.timings = []
+    _local.budget = budget
+    started = time.time()
+    try:
+        succeeded, result = True, fn(*args, **kwargs)
+    except Exception as exc:
+        succeeded, result, timings = False, exc, None
+    finally:
+        _local.timings, _local.budget = previous
+        if profiler is not None:
+            profiler.disable()
+    finished = time.time()
+    call = (started, finished, _profile_stats(profiler))
+    return succeeded, result, worker_id(), timings or [(started, finished)], call
+
+
+def run_chunk(fn, items):
+    outcomes = []
+    timings = getattr(_local, "timings", None)
+    for args, kwargs in items:
+        started = time.time()
+        if cancelled():
+            outcomes.append((False, exceptions.CancelledException()))
+        else:
+            try:
+                outcomes.append((True, fn(*args, **kwargs)))
+            except Exception as exc:
+                outcomes.append((False, exc))
+        if timings is not None:
+            timings.append((started, time.time()))
+    return outcomes
+
+
+# Callables (and their extras) registered by the pool initializer, so they
+# are sent to each worker process only once
+_registry = {}
+
+
+def register(token, fn, extras):
+    _registry[token] = (fn, extras)
+
+
+def _registered(token, kwargs):
+    fn, extras = _registry[token]
+    if extras:
+        kwargs = {**extras, **kwargs}
+    return fn, kwargs
+
+
+def run_registered(token, args, kwargs):
+    fn, kwargs = _registered(token, kwargs)
+    return fn(*args, **kwargs)
+
+
+def run_registered_chunk(token, items):
+    fn, extras = _registry[token]
+    if extras:
+        items = [(args, {**extras, **kwargs}) for args, kwargs in items]
+    return run_chunk(fn, items)
@@ -1,4 +1,9 @@
+import os
+import sys
 import time
+import functools
+import threading
+import subprocess
 
 import parallel
 
@@ -17,7 +22,9 @@ __all__ = [
     'sleep_return_single_param_decorated_timeout',
     'sleep_return_multi_param_decorated_max_workers',
 
-    'TestingException'
+    'TestingException',
+    'run_script',
+    'build_counting',
 ]
 
 class TestingException(Exception):
@@ -103,4 +110,30 @@ def sleep_return_multi_param_decorated_max_workers(sleep, result):
     if type(sleep) == str:
         raise TestingException(sleep)
     time.sleep(sleep)
-    return result
\ No newline at end of file
+    return result
+
+def run_script(source, timeout=30):
+    """Run `source` in a new interpreter (ie: to check it exits), returns
+    the `CompletedProcess`."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root)
+    return subprocess.run(
+        [sys.executable, '-c', source], env=env, timeout=timeout,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+
+
+def build_counting(fn, fail_on=()):
+    """Wrap `fn` recording the (first) argument of each call, values in
+    `fail_on` raise a `ValueError`. Returns the wrapper and the calls."""
+    calls = []
+    lock = threading.Lock()
+
+    @functools.wraps(fn)
+    def counting(value, *args, **kwargs):
+        with lock:
+            calls.append(value)
+        if value in fail_on:
+            raise ValueError(value)
+        return fn(value, *args, **kwargs)
+
+    return counting, calls
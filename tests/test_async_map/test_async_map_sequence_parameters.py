@@ -75,4 +75,11 @@ def test_async_without_context_manager():
     )
     ex.start()
     assert ex.results() == ["a", "b", "c"]
-    ex.shutdown()
\ No newline at end of file
+    ex.shutdown()
+
+def test_async_map_as_completed():
+    with parallel.async_map(
+        sleep_return_multi_param, [(0.3, "a"), (0.1, "b"), (0.2, "c")]
+    ) as ex:
+        assert list(ex.as_completed()) == [(1, "b"), (2, "c"), (0, "a")]
+        assert ex.status is parallel.DONE
@@ -0,0 +1,127 @@
+import os
+import time
+import pickle
+
+import pytest
+
+import parallel
+from parallel.checkpoint import Checkpoint
+
+from .base import *
+
+
+def squared(x):
+    return x * x
+
+
+def explode():
+    raise RuntimeError('unpicklable')
+
+
+class Exploding:
+    def __reduce__(self):
+        return explode, ()
+
+
+def test_map_resumes_from_checkpoint(tmp_path):
+    path = str(tmp_path / 'map.ckpt')
+    square, calls = build_counting(squared, fail_on={3})
+    results = parallel.map(square, range(6), checkpoint=path, silent=True)
+    assert results.failures
+
+    # Only the failed job runs again
+    square, calls = build_counting(squared)
+    results = parallel.map(square, range(6), checkpoint=path)
+    assert results == [0, 1, 4, 9, 16, 25]
+    assert calls == [3]
+
+    square, calls = build_counting(squared)
+    assert parallel.map(square, range(6), checkpoint=path) == [0, 1, 4, 9, 16, 25]
+    assert calls == []
+
+
+def test_map_checkpoint_after_fail_fast(tmp_path):
+    path = str(tmp_path / 'map.ckpt')
+    square, calls = build_counting(squared, fail_on={2})
+    with pytest.raises(ValueError):
+        parallel.map(square, range(5), max_workers=1, checkpoint=path)
+
+    # The jobs completed before the failure were recorded
+    square, calls = build_counting(squared)
+    assert parallel.map(square, range(5), max_workers=1, checkpoint=path) == [0, 1, 4, 9, 16]
+    assert 0 not in calls and 1 not in calls
+    assert 2 in calls
+
+
+def test_par_named_checkpoint(tmp_path):
+    path = str(tmp_path / 'par.ckpt')
+    square, calls = build_counting(squared, fail_on={2})
+    parallel.par({'a': (square, 1), 'b': (square, 2)}, checkpoint=path, silent=True)
+
+    square, calls = build_counting(squared)
+    results = parallel.par({'a': (square, 1), 'b': (square, 2)}, checkpoint=path)
+    assert results == {'a': 1, 'b': 4}
+    assert calls == [2]
+
+
+def test_checkpoint_batches_writes(tmp_path):
+    path = str(tmp_path / 'map.ckpt')
+    checkpoint = Checkpoint(path, interval=3600)
+    checkpoint.open()
+    checkpoint.add(0, 'a')
+    checkpoint.add(1, 'b')
+    # Buffered until the interval passes (or it's closed)
+    with open(path, 'rb') as fp:
+        assert fp.read() == b''
+    checkpoint.close()
+
+    checkpoint = Checkpoint(path)
+    checkpoint.open()
+    assert len(checkpoint) == 2
+    assert checkpoint.get(1) == 'b'
+    checkpoint.close()
+
+
+def test_checkpoint_discards_truncated_record(tmp_path):
+    path = str(tmp_path / 'map.ckpt')
+    record = pickle.dumps((1, 'one'))
+    with open(path, 'wb') as fp:
+        fp.write(pickle.dumps((0, 'zero')) + record[:-3])
+
+    checkpoint = Checkpoint(path)
+    checkpoint.open()
+    assert 0 in checkpoint and 1 not in checkpoint
+    checkpoint.add(1, 'one')
+    checkpoint.close()
+
+    checkpoint = Checkpoint(path)
+    checkpoint.open()
+    assert checkpoint.get(1) == 'one'
+    checkpoint.close()
+
+
+def test_checkpoint_flushes_while_waiting(tmp_path):
+    path = str(tmp_path / 'map.ckpt')
+
+    def job(x):
+        if x:
+            # The result of the first job is written in the meantime
+            time.sleep(.5)
+            return os.path.getsize(path)
+        return x
+
+    results = parallel.map(job, range(2), max_workers=2, checkpoint=Checkpoint(path, interval=.1))
+    assert results[1] > 0
+
+
+def test_checkpoint_load_errors_propagate(tmp_path):
+    path = str(tmp_path / 'map.ckpt')
+    data = pickle.dumps((0, 'zero')) + pickle.dumps((1, Exploding()))
+    with open(path, 'wb') as fp:
+        fp.write(data)
+
+    with pytest.raises(RuntimeError):
+        Checkpoint(path).open()
+    # Not mistaken for a truncated record
+    with open(path, 'rb') as fp:
+        assert fp.read() == data
@@ -0,0 +1,119 @@
+import time
+import threading
+
+import parallel
+from parallel.cache import MemoryCache, DiskCache, MISSING
+
+from ..base import *
+
+
+def slow_square(value):
+    time.sleep(.05)
+    return value ** 2
+
+
+def build_square(**options):
+    square, calls = build_counting(slow_square, fail_on={'Will Fail'})
+    return parallel.decorate(**options)(square), calls
+
+
+def test_cache_skips_cached_jobs():
+    square, calls = build_square(cache=True)
+    assert square.map([1, 2, 3]) == [1, 4, 9]
+    assert sorted(calls) == [1, 2, 3]
+
+    assert square.map([3, 4, 1]) == [9, 16, 1]
+    assert square.map({'a': 4, 'b': 5}) == {'a': 16, 'b': 25}
+    assert sorted(calls) == [1, 2, 3, 4, 5]
+
+
+def test_cache_deduplicates_within_batch():
+    square, calls = build_square(cache=True)
+    assert square.map([2, 2, 3, 2, 3], max_workers=5) == [4, 4, 9, 4, 9]
+    assert sorted(calls) == [2, 3]
+    assert list(square.imap([3, 2, 3], max_in_flight=1)) == [(0, 9), (1, 4), (2, 9)]
+    assert sorted(calls) == [2, 3]
+
+
+def test_cache_doesnt_store_failures():
+    square, calls = build_square(cache=True)
+    results = square.map(['Will Fail', 'Will Fail', 2], silent=True)
+    assert [type(r) for r in results] == [parallel.FailedTask, parallel.FailedTask, int]
+    results = square.map(['Will Fail'], silent=True)
+    assert calls.count('Will Fail') == 2
+
+
+def test_disk_cache_skips_unserializable_arguments(tmp_path):
+    calls = []
+
+    @parallel.decorate(cache=str(tmp_path / 'cache.db'))
+    def call_count(lock):
+        calls.append(lock)
+        return len(calls)
+
+    lock = threading.Lock()
+    call_count.map([lock])
+    call_count.map([lock])
+    assert len(calls) == 2
+
+
+# Module level (without a closure), to be shared through the disk cache
+square_calls = []
+
+
+def square(value):
+    square_calls.append(value)
+    return value ** 2
+
+
+def test_disk_cache_is_shared(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    del square_calls[:]
+    cached = parallel.decorate(cache=path)(square)
+    assert cached.thread.map([1, 2]) == [1, 4]
+    assert len(cached.cache) == 2
+
+    cached = parallel.decorate(cache=DiskCache(path))(square)
+    assert cached.map([2, 1, 3]) == [4, 1, 9]
+    assert square_calls[2:] == [3]
+
+
+def make_scale(factor, cache):
+    @parallel.decorate(cache=cache)
+    def scale(value):
+        return value * factor
+
+    return scale
+
+
+def test_cache_distinguishes_closures(tmp_path):
+    for cache in [MemoryCache(), DiskCache(str(tmp_path / 'cache.db'))]:
+        assert make_scale(2, cache).map([1, 2]) == [2, 4]
+        assert make_scale(3, cache).map([1, 2]) == [3, 6]
+        assert make_scale(2, cache).map([1, 2]) == [2, 4]
+
+
+def test_memory_cache_eviction():
+    cache = MemoryCache(maxsize=2, ttl=.2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    cache.set('c', 3)
+    assert cache.get('b') is MISSING
+    assert len(cache) == 2
+    time.sleep(.2)
+    assert cache.get('a', None) is None
+
+
+def test_disk_cache_eviction(tmp_path):
+    cache = DiskCache(str(tmp_path / 'cache.db'), max_bytes=150, ttl=.2)
+    cache.set('a', b'x' * 40)
+    cache.set('b', b'x' * 40)
+    assert cache.get('a') == b'x' * 40
+    cache.set('c', b'x' * 40)
+    assert cache.get('b') is MISSING
+    assert len(cache) == 2
+    time.sleep(.2)
+    assert cache.get('a') is MISSING
+    cache.clear()
+    assert len(cache) == 0
@@ -0,0 +1,129 @@
+import time
+import asyncio
+
+import pytest
+
+import parallel
+from parallel import AsyncioExecutor
+from parallel.models import ParallelJob
+
+from ...base import TestingException
+
+
+def run(coroutine):
+    # `asyncio.run` needs Python 3.7+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+async def async_sleep_return(sleep, result):
+    if type(sleep) == str:
+        raise TestingException(sleep)
+    await asyncio.sleep(sleep)
+    return result
+
+
+class ConcurrencyCounter:
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+
+    async def __call__(self, value):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(.01)
+        self.running -= 1
+        return value
+
+
+def test_asyncio_executor_runs_concurrently():
+    start = time.time()
+    results = parallel.map(
+        async_sleep_return, [(.2, 'a'), (.2, 'b'), (.2, 'c')],
+        executor=parallel.ASYNCIO_EXECUTOR)
+    assert results == ['a', 'b', 'c']
+    assert time.time() - start < .5
+
+    results = parallel.map(async_sleep_return, {
+        'r1': (.1, 'a'),
+        'r2': (.1, 'b'),
+    }, executor=parallel.ASYNCIO_EXECUTOR)
+    assert results == {'r1': 'a', 'r2': 'b'}
+
+
+def test_asyncio_executor_max_workers():
+    counter = ConcurrencyCounter()
+    results = parallel.map(
+        counter, range(20), executor=parallel.ASYNCIO_EXECUTOR, max_workers=3)
+    assert results == list(range(20))
+    assert counter.max_running == 3
+
+
+def test_asyncio_executor_max_workers_with_chunks():
+    counter = ConcurrencyCounter()
+    results = parallel.map(
+        counter, range(40), executor=parallel.ASYNCIO_EXECUTOR, max_workers=2,
+        chunksize=20)
+    assert results == list(range(40))
+    assert counter.max_running == 2
+
+
+def test_asyncio_executor_silent_and_chunks():
+    results = parallel.map(
+        async_sleep_return, [(.1, 'a'), ('Will Fail', 'b'), (.1, 'c')],
+        executor=parallel.ASYNCIO_EXECUTOR, silent=True, chunksize=2)
+    assert results == [
+        'a',
+        parallel.FailedTask(
+            ParallelJob(async_sleep_return, args=('Will Fail', 'b')),
+            exc=TestingException('Will Fail')
+        ),
+        'c',
+    ]
+
+    with pytest.raises(TestingException):
+        parallel.map(
+            async_sleep_return, [(.1, 'a'), ('Will Fail', 'b')],
+            executor=parallel.ASYNCIO_EXECUTOR)
+
+
+def test_asyncio_executor_jobs():
+    jobs = [ParallelJob(async_sleep_return, args=(.1, 'a'))]
+    ex = AsyncioExecutor(jobs)
+    ex.start()
+    assert ex.results() == ['a']
+    ex.shutdown()
+
+
+def test_asyncio_pool():
+    with parallel.Pool(parallel.ASYNCIO_EXECUTOR, max_workers=10) as pool:
+        assert pool.map(async_sleep_return, [(.1, 'a')]) == ['a']
+        assert pool.map(async_sleep_return, [(.1, 'b')]) == ['b']
+
+
+def test_amap():
+    results = run(parallel.amap(async_sleep_return, [(.1, 'a'), (.1, 'b')]))
+    assert results == ['a', 'b']
+    assert isinstance(results, parallel.SequentialMapResult)
+
+    results = run(parallel.amap(
+        async_sleep_return, {'r1': (.1, 'a'), 'r2': ('Will Fail', 'b')}, silent=True))
+    assert results.failures is True
+    assert results['r1'] == 'a'
+
+    with pytest.raises(parallel.exceptions.TimeoutException):
+        run(parallel.amap(async_sleep_return, [(1, 'a')], timeout=.1))
+
+
+def test_apar():
+    results = run(parallel.apar({
+        'r1': parallel.job(async_sleep_return, .1, 'a'),
+        'r2': parallel.job(async_sleep_return, .1, result='b'),
+    }, max_workers=1))
+    assert results == {'r1': 'a', 'r2': 'b'}
+
+    with pytest.raises(TestingException):
+        run(parallel.apar([(async_sleep_return, 'Will Fail', 'a')]))
@@ -0,0 +1,62 @@
+import parallel
+from parallel import ProcessExecutor
+from parallel.models import ParallelJob
+
+from ...base import *
+
+
+class CountingCallable:
+    pickled = 0
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def __getstate__(self):
+        CountingCallable.pickled += 1
+        return self.__dict__
+
+    def __call__(self, value, suffix=''):
+        return '{}{}{}'.format(self.payload, value, suffix)
+
+
+def test_process_executor_registers_callable_once():
+    CountingCallable.pickled = 0
+    fn = CountingCallable('x' * 1000)
+    params = [(i, ) for i in range(20)]
+
+    results = parallel.process.map(fn, params, max_workers=2)
+    assert results == ['x' * 1000 + str(i) for i in range(20)]
+    assert CountingCallable.pickled <= 2
+
+
+def test_process_executor_registered_extras():
+    params = [(.1, 'a'), (.1, {'result': 'b', 'uppercase': False}), (.1, 'c')]
+    results = parallel.process.map(
+        sleep_return_optional_param, params, extras={'uppercase': True})
+    assert results == ['A', 'b', 'C']
+
+    results = parallel.process.map(
+        sleep_return_optional_param, params, extras={'uppercase': True}, chunksize=2)
+    assert results == ['A', 'b', 'C']
+
+
+def test_process_executor_registered_failures():
+    results = parallel.process.map(sleep_return_multi_param, [
+        (.1, 'a'), ('Will Fail', 'b')
+    ], extras={}, silent=True, chunksize=2)
+    assert results == [
+        'a',
+        parallel.FailedTask(
+            ParallelJob(sleep_return_multi_param, args=('Will Fail', 'b')),
+            exc=TestingException('Will Fail')
+        ),
+    ]
+
+
+def test_process_executor_different_callables():
+    jobs = [
+        ParallelJob(sleep_return_multi_param, args=(.1, 'a')),
+        ParallelJob(sleep_return_single_param, args=(.1, )),
+    ]
+    with ProcessExecutor(jobs, fn=sleep_return_multi_param) as ex:
+        assert ex.results() == ['a', '0.1']
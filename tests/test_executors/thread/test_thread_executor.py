@@ -119,4 +119,13 @@ def test_executor_started_raises_exception():
 
 # Nice to have
 # * Retries
-# *
\ No newline at end of file
+# *
+
+def test_executor_failure_cancels_token():
+    mocked_fn = MagicMock(side_effect=ValueError('Testing'))
+    ex = ThreadExecutor([ParallelJob(mocked_fn, args=(2, 2))])
+    ex.start()
+    with pytest.raises(ValueError):
+        ex.results()
+    ex.shutdown()
+    assert ex.cancel_token.cancelled is True
@@ -0,0 +1,119 @@
+import pytest
+
+import parallel
+from parallel import ThreadExecutor
+from parallel.models import ParallelJob
+
+from .base import *
+
+
+class RecordingHooks(parallel.Hooks):
+    def __init__(self):
+        self.events = []
+
+    def on_batch_start(self, executor):
+        self.events.append(('batch_start', None))
+
+    def on_submit(self, job):
+        self.events.append(('submit', job.args[0]))
+
+    def on_start(self, job):
+        assert job.started_at is not None
+        self.events.append(('start', job.args[0]))
+
+    def on_complete(self, job, result):
+        self.events.append(('complete', result))
+
+    def on_error(self, job, exc):
+        self.events.append(('error', job.args[0]))
+
+    def on_batch_done(self, executor):
+        self.events.append(('batch_done', executor.stats.jobs))
+
+
+def test_hooks_are_invoked():
+    hooks = RecordingHooks()
+    results = parallel.map(
+        sleep_return_single_param, [.1, 'Will Fail'], hooks=hooks, silent=True)
+    assert results[0] == '0.1'
+
+    events = hooks.events
+    assert events[0] == ('batch_start', None)
+    assert events[-1] == ('batch_done', 2)
+    assert sorted(events[1:-1], key=str) == sorted([
+        ('submit', .1), ('submit', 'Will Fail'),
+        ('start', .1), ('start', 'Will Fail'),
+        ('complete', '0.1'), ('error', 'Will Fail'),
+    ], key=str)
+    assert events.index(('submit', .1)) < events.index(('start', .1)) < events.index(('complete', '0.1'))
+
+
+def test_hooks_on_chunks_and_pool():
+    first, second = RecordingHooks(), RecordingHooks()
+    with parallel.Pool(parallel.PROCESS_EXECUTOR, max_workers=2, hooks=[first, second]) as pool:
+        assert pool.map(sleep_return_single_param, [0, 0, 0], chunksize=2) == ['0', '0', '0']
+    assert first.events == second.events
+    assert first.events.count(('complete', '0')) == 3
+    assert first.events[-1] == ('batch_done', 3)
+
+
+def test_hooks_are_optional():
+    jobs = [ParallelJob(sleep_return_single_param, args=(0, ))]
+    with ThreadExecutor(jobs, hooks=parallel.Hooks()) as ex:
+        assert ex.results() == ['0']
+    with ThreadExecutor(jobs) as ex:
+        assert ex.hooks is None
+
+
+def current_trace_ids(_):
+    from opentelemetry import trace
+
+    context = trace.get_current_span().get_span_context()
+    return context.trace_id, context.span_id
+
+
+@pytest.mark.parametrize('executor', [parallel.THREAD_EXECUTOR, parallel.PROCESS_EXECUTOR])
+def test_tracing_propagates_span_context(executor):
+    pytest.importorskip('opentelemetry.sdk')
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+    from parallel.tracing import TracingHooks
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    hooks = TracingHooks(tracer=provider.get_tracer('tests'))
+
+    results = parallel.map(current_trace_ids, ['a', 'b'], executor=executor, hooks=hooks)
+
+    spans = exporter.get_finished_spans()
+    batch, = [span for span in spans if span.name == 'parallel.batch']
+    jobs = [span for span in spans if span.name == 'parallel.job']
+    assert len(jobs) == 2
+    assert all(span.parent.span_id == batch.context.span_id for span in jobs)
+    assert all(span.attributes['parallel.worker'] for span in jobs)
+    # Jobs run with their span as the current one
+    assert sorted(results) == sorted(
+        (span.context.trace_id, span.context.span_id) for span in jobs)
+
+
+def test_tracing_records_errors():
+    pytest.importorskip('opentelemetry.sdk')
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+    from opentelemetry.trace import StatusCode
+    from parallel.tracing import TracingHooks
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    hooks = TracingHooks(tracer=provider.get_tracer('tests'))
+
+    with pytest.raises(TypeError):
+        parallel.map(sleep_return_single_param, ['Will Fail'], hooks=hooks)
+    job, batch = exporter.get_finished_spans()
+    assert job.status.status_code == StatusCode.ERROR
+    assert job.events[0].name == 'exception'
+    assert batch.name == 'parallel.batch'
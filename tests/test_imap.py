@@ -0,0 +1,67 @@
+import time
+
+import pytest
+
+import parallel
+from parallel.models import ParallelJob
+
+from .base import *
+
+
+def test_imap_ordered():
+    results = parallel.imap(sleep_return_multi_param, [(.3, 'a'), (.1, 'b'), (.2, 'c')])
+    assert list(results) == [(0, 'a'), (1, 'b'), (2, 'c')]
+
+
+def test_imap_unordered_yields_in_completion_order():
+    results = parallel.imap(
+        sleep_return_multi_param, [(.3, 'a'), (.1, 'b'), (.2, 'c')], ordered=False)
+    assert list(results) == [(1, 'b'), (2, 'c'), (0, 'a')]
+
+
+def test_imap_named_parameters():
+    results = parallel.imap(sleep_return_multi_param, {
+        'r1': (.2, 'a'),
+        'r2': (.1, 'b'),
+    }, ordered=False)
+    assert list(results) == [('r2', 'b'), ('r1', 'a')]
+
+
+def test_imap_silent_and_exceptions():
+    results = parallel.imap(
+        sleep_return_multi_param, [(.1, 'a'), ('Will Fail', 'b')], silent=True)
+    assert list(results) == [
+        (0, 'a'),
+        (1, parallel.FailedTask(
+            ParallelJob(sleep_return_multi_param, args=('Will Fail', 'b')),
+            exc=TestingException('Will Fail'))),
+    ]
+
+    with pytest.raises(TestingException):
+        list(parallel.imap(sleep_return_multi_param, [(.1, 'a'), ('Will Fail', 'b')]))
+
+
+def test_imap_timeout():
+    with pytest.raises(parallel.exceptions.TimeoutException):
+        list(parallel.imap(sleep_return_single_param, [1], ordered=False, timeout=.1))
+
+
+def test_imap_decorated():
+    results = sleep_return_multi_param_decorated.imap([(.2, 'a'), (.1, 'b')], ordered=False)
+    assert list(results) == [(1, 'b'), (0, 'a')]
+
+
+def test_imap_closed_early_cancels_pending_jobs():
+    calls = []
+
+    def record(value):
+        calls.append(value)
+        time.sleep(.1)
+        return value
+
+    start = time.time()
+    for index, result in parallel.imap(record, range(20), max_workers=2):
+        break
+    assert time.time() - start < .5
+    time.sleep(.2)
+    assert len(calls) < 6
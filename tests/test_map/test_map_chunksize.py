@@ -0,0 +1,83 @@
+import pytest
+from unittest.mock import MagicMock
+
+import parallel
+from parallel import ThreadExecutor
+from parallel.models import ParallelJob
+
+from ..base import *
+
+
+def test_map_chunksize_process():
+    results = parallel.process.map(
+        sleep_return_multi_param,
+        [(.1, 'a'), (.1, 'b'), (.1, 'c'), (.1, 'd'), (.1, 'e')],
+        chunksize=2)
+    assert results == ['a', 'b', 'c', 'd', 'e']
+    assert isinstance(results, parallel.SequentialMapResult)
+
+
+def test_map_chunksize_named_parameters():
+    results = parallel.map(sleep_return_multi_param, {
+        'r1': (.1, 'a'),
+        'r2': (.1, {'result': 'b'}),
+        'r3': (.1, 'c'),
+    }, chunksize=2, executor=parallel.PROCESS_EXECUTOR)
+    assert results == {'r1': 'a', 'r2': 'b', 'r3': 'c'}
+
+
+def test_map_chunksize_silent_failures_per_job():
+    results = parallel.process.map(sleep_return_multi_param, [
+        (.1, 'a'), ('Will Fail', 'b'), (.1, 'c')
+    ], chunksize=3, silent=True)
+
+    assert results.failures is True
+    assert results == [
+        'a',
+        parallel.FailedTask(
+            ParallelJob(sleep_return_multi_param, args=('Will Fail', 'b')),
+            exc=TestingException('Will Fail')
+        ),
+        'c'
+    ]
+
+
+def test_map_chunksize_exceptions_propagated():
+    with pytest.raises(TestingException):
+        parallel.map(sleep_return_multi_param, [
+            (.1, 'a'), ('Will Fail', 'b'), (.1, 'c')
+        ], chunksize=2)
+
+
+def test_map_chunksize_auto():
+    results = parallel.process.map(
+        sleep_return_multi_param, [(0, i) for i in range(100)],
+        chunksize='auto', max_workers=2)
+    assert results == list(range(100))
+
+    results = sleep_return_multi_param_decorated.map(
+        ((0, i) for i in range(10)), chunksize='auto')
+    assert results == list(range(10))
+
+
+class ChunkRecordingExecutor(ThreadExecutor):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.chunks = []
+
+    def _submit(self, batch):
+        self.chunks.append([index for index, _ in batch])
+        super()._submit(batch)
+
+
+def test_executor_chunks_share_a_single_call():
+    mocked_fn = MagicMock(return_value=None)
+    jobs = [ParallelJob(mocked_fn, args=(i, )) for i in range(5)]
+
+    with ChunkRecordingExecutor(jobs, chunksize=2) as ex:
+        assert ex.results() == [None] * 5
+
+    assert ex.chunks == [[0, 1], [2, 3], [4]]
+    assert mocked_fn.call_count == 5
+    # Futures are released once jobs complete
+    assert all(job.future is None for job in jobs)
@@ -0,0 +1,81 @@
+import time
+
+import pytest
+
+import parallel
+
+from ..base import *
+
+
+def test_map_deadline_bounds_the_whole_batch():
+    start = time.time()
+    with pytest.raises(parallel.exceptions.TimeoutException):
+        parallel.map(sleep_return_single_param, [.3, .3, .3, .3], max_workers=1, deadline=.5)
+    assert time.time() - start < .9
+
+
+def test_map_deadline_silent_partial_results():
+    results = parallel.map(
+        sleep_return_multi_param, [(.1, 'a'), (1, 'b'), (.1, 'c'), (.1, 'd')],
+        max_workers=2, deadline=.5, silent=True)
+
+    assert results.failures is True
+    assert (results[0], results[2], results[3]) == ('a', 'c', 'd')
+    assert isinstance(results[1], parallel.FailedTask)
+    assert results[1].timed_out is True
+
+
+def test_map_deadline_cancels_pending_jobs():
+    calls = []
+
+    def record(value):
+        calls.append(value)
+        time.sleep(.2)
+        return value
+
+    results = parallel.map(record, range(10), max_workers=1, deadline=.3, silent=True)
+    assert results[0] == 0
+    assert len(results) == 10
+    assert len(calls) < 5
+    assert all(r.timed_out for r in results[len(calls):])
+
+
+def test_map_deadline_named_and_max_in_flight():
+    results = parallel.map(sleep_return_multi_param, {
+        'r1': (.1, 'a'),
+        'r2': (1, 'b'),
+        'r3': (1, 'c'),
+    }, max_workers=1, max_in_flight=1, deadline=.3, silent=True)
+    assert results['r1'] == 'a'
+    assert results['r2'].timed_out is True
+    assert results['r3'].timed_out is True
+
+
+def test_map_deadline_not_reached():
+    results = parallel.map(sleep_return_single_param, [.1, .1], deadline=5)
+    assert results == ['0.1', '0.1']
+
+
+def test_imap_deadline_unordered():
+    results = dict(parallel.imap(
+        sleep_return_single_param, [.1, 1], ordered=False, deadline=.3, silent=True))
+    assert results[0] == '0.1'
+    assert results[1].timed_out is True
+
+
+PROCESS_DEADLINE = """
+import time
+import parallel
+
+results = parallel.map(
+    time.sleep, [.05, 2, .05], executor=parallel.PROCESS_EXECUTOR, max_workers=2,
+    deadline=.2, silent=True)
+print([failed.timed_out for failed in results.failed])
+"""
+
+
+def test_map_process_executor_deadline_exits():
+    # The interpreter exits once the expired batch is cancelled
+    process = run_script(PROCESS_DEADLINE)
+    assert process.returncode == 0, process.stderr
+    assert process.stdout.strip() == '[True]'
@@ -0,0 +1,58 @@
+import parallel
+from parallel.cache import job_key
+from parallel.models import ParallelJob
+
+from ..base import *
+
+
+def to_text(value, suffix=''):
+    return '{}{}'.format(value, suffix)
+
+
+def test_map_dedupe_sequence():
+    describe, calls = build_counting(to_text)
+    results = parallel.map(describe, [1, 2, 1, 1, 3, 2], dedupe=True)
+    assert results == ['1', '2', '1', '1', '3', '2']
+    assert sorted(calls) == [1, 2, 3]
+
+
+def test_map_dedupe_named_and_unhashable():
+    describe, calls = build_counting(to_text)
+    results = parallel.map(describe, {
+        'a': [[1, 2]],
+        'b': [[1, 2]],
+        'c': [[3]],
+    }, dedupe=True)
+    assert results == {'a': '[1, 2]', 'b': '[1, 2]', 'c': '[3]'}
+    assert len(calls) == 2
+
+
+def test_map_dedupe_distinguishes_types():
+    describe, calls = build_counting(to_text)
+    results = parallel.map(describe, [1, 1.0, True, 1], extras={'suffix': '!'}, dedupe=True)
+    assert results == ['1!', '1.0!', 'True!', '1!']
+    assert len(calls) == 3
+
+    results = parallel.map(repr, [(1, 2), (1.0, 2), (True, 2)], unpack_arguments=False, dedupe=True)
+    assert results == ['(1, 2)', '(1.0, 2)', '(True, 2)']
+
+
+def test_map_dedupe_failures_and_streaming():
+    results = parallel.map(
+        sleep_return_single_param, ['Will Fail', .1, 'Will Fail'], dedupe=True, silent=True)
+    assert results.failures
+    assert [failed.job.args for failed in results.failed] == [('Will Fail', ), ('Will Fail', )]
+
+    describe, calls = build_counting(to_text)
+    results = parallel.imap(describe, iter([1, 1, 2, 1]), dedupe=True, max_in_flight=2)
+    assert list(results) == [(0, '1'), (1, '1'), (2, '2'), (3, '1')]
+    assert sorted(calls) == [1, 2]
+
+
+def test_job_key():
+    job = ParallelJob(len, args=(1, ), kwargs={'a': [1]})
+    # Unhashable arguments are replaced by their digest
+    assert job_key(job) == job_key(ParallelJob(len, args=(1, ), kwargs={'a': [1]}))
+    assert job_key(job) != job_key(ParallelJob(repr, args=(1, ), kwargs={'a': [1]}))
+    assert job_key(ParallelJob(len, args=(1, ))) == job_key(ParallelJob(len, args=(1, )))
+    assert job_key(ParallelJob(len, args=(1, ))) != job_key(ParallelJob(len, args=(1.0, )))
@@ -0,0 +1,73 @@
+import time
+import threading
+
+import pytest
+
+import parallel
+
+from ..base import *
+
+
+def test_map_first_failure_raised_immediately():
+    start = time.time()
+    with pytest.raises(TestingException):
+        parallel.map(sleep_return_multi_param, [(1, 'a'), ('Will Fail', 'b')])
+    assert time.time() - start < .5
+
+
+def test_map_failure_cancels_pending_jobs():
+    calls = []
+
+    def record(value):
+        if value == 0:
+            raise TestingException('Fail')
+        calls.append(value)
+        time.sleep(.1)
+        return value
+
+    with pytest.raises(TestingException):
+        parallel.map(record, range(20), max_workers=1)
+    time.sleep(.2)
+    assert len(calls) < 3
+
+
+def test_map_running_jobs_can_poll_cancellation():
+    stopped = threading.Event()
+
+    def long_running(value):
+        if value == 'fail':
+            time.sleep(.1)
+            raise TestingException(value)
+        while not parallel.cancelled():
+            time.sleep(.01)
+        stopped.set()
+        return value
+
+    with pytest.raises(TestingException):
+        parallel.map(long_running, ['loop', 'fail'])
+    assert stopped.wait(1) is True
+
+
+PROCESS_FAIL_FAST = """
+import parallel
+from tests.base import sleep_return_multi_param, TestingException
+
+try:
+    parallel.map(
+        sleep_return_multi_param, [(.5, 'a'), ('Will Fail', 'b'), (.1, 'c')],
+        executor=parallel.PROCESS_EXECUTOR, max_workers=2)
+except TestingException:
+    print('raised')
+"""
+
+
+def test_map_process_executor_fail_fast_exits():
+    # The interpreter exits once the batch is cancelled
+    process = run_script(PROCESS_FAIL_FAST)
+    assert process.returncode == 0, process.stderr
+    assert process.stdout.strip() == 'raised'
+    assert 'Error' not in process.stderr
+
+
+def test_cancelled_outside_jobs():
+    assert parallel.cancelled() is False
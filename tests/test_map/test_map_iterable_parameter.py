@@ -0,0 +1,73 @@
+import time
+import itertools
+import threading
+
+import parallel
+
+from ..base import *
+
+
+class ConcurrencyCounter:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def __call__(self, value):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(.01)
+        with self.lock:
+            self.running -= 1
+        return value * 2
+
+
+def test_map_generator_parameters():
+    results = parallel.map(sleep_return_multi_param, ((.1, r) for r in 'abc'))
+    assert results == ['a', 'b', 'c']
+    assert isinstance(results, parallel.SequentialMapResult)
+
+
+def test_map_max_in_flight():
+    counter = ConcurrencyCounter()
+    results = parallel.map(counter, range(50), max_workers=10, max_in_flight=3)
+    assert results == [i * 2 for i in range(50)]
+    assert counter.max_running <= 3
+
+
+def test_map_max_in_flight_named_parameters():
+    results = parallel.map(sleep_return_multi_param, {
+        'r1': (.2, 'a'),
+        'r2': (.1, 'b'),
+        'r3': (.1, 'c'),
+    }, max_in_flight=2)
+    assert results == {'r1': 'a', 'r2': 'b', 'r3': 'c'}
+
+
+def test_imap_infinite_generator():
+    counter = ConcurrencyCounter()
+    consumed = []
+
+    def numbers():
+        for i in itertools.count():
+            consumed.append(i)
+            yield i
+
+    results = parallel.imap(counter, numbers(), max_in_flight=4, ordered=False)
+    first = [result for _, result in itertools.islice(results, 10)]
+    results.close()
+
+    assert len(first) == 10
+    assert all(result % 2 == 0 for result in first)
+    assert len(consumed) <= 14
+    assert counter.max_running <= 4
+
+
+def test_par_max_in_flight():
+    results = parallel.par([
+        (sleep_return_multi_param, .1, 'a'),
+        (sleep_return_multi_param, .1, 'b'),
+        (sleep_return_multi_param, .1, 'c'),
+    ], max_in_flight=1)
+    assert results == ['a', 'b', 'c']
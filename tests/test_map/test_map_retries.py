@@ -0,0 +1,94 @@
+import time
+import threading
+
+import pytest
+
+import parallel
+
+from ..base import *
+
+
+class Flaky:
+    """Fails the first `failures` times it's invoked with each value"""
+
+    def __init__(self, failures, exc=TestingException):
+        self.failures = failures
+        self.exc = exc
+        self.calls = {}
+        self.lock = threading.Lock()
+
+    def __call__(self, value):
+        with self.lock:
+            self.calls[value] = self.calls.get(value, 0) + 1
+            calls = self.calls[value]
+        if calls <= self.failures:
+            raise self.exc('Attempt {}'.format(calls))
+        return value
+
+
+def test_map_retries_succeed():
+    fn = Flaky(failures=2)
+    results = parallel.map(fn, [1, 2, 3], retries=2)
+    assert results == [1, 2, 3]
+    assert fn.calls == {1: 3, 2: 3, 3: 3}
+
+
+def test_map_retries_exhausted_history():
+    fn = Flaky(failures=5)
+    results = parallel.map(fn, {'a': 1}, retries=2, silent=True)
+    failed = results['a']
+    assert isinstance(failed, parallel.FailedTask)
+    assert failed.attempts == 3
+    assert failed.exc == TestingException('Attempt 3')
+    assert failed.history == [TestingException('Attempt 1'), TestingException('Attempt 2')]
+
+    with pytest.raises(TestingException):
+        parallel.map(Flaky(failures=5), [1], retries=1)
+
+
+def test_map_retry_on():
+    fn = Flaky(failures=1, exc=ValueError)
+    results = parallel.map(fn, [1], retries=3, retry_on=(TestingException, ), silent=True)
+    assert results.failures is True
+    assert fn.calls == {1: 1}
+
+
+def test_map_retries_backoff_run_concurrently():
+    fn = Flaky(failures=1)
+    start = time.time()
+    results = parallel.map(fn, list(range(10)), retries=1, backoff=.2, max_workers=10)
+    assert results == list(range(10))
+    assert time.time() - start < .6
+
+    delays = []
+    results = parallel.map(
+        Flaky(failures=2), [1], retries=2, backoff=lambda attempt: delays.append(attempt) or 0)
+    assert results == [1]
+    assert delays == [1, 2]
+
+
+def test_map_retries_with_chunks_and_window():
+    fn = Flaky(failures=1)
+    results = parallel.map(fn, range(20), retries=1, chunksize=3, max_in_flight=2)
+    assert results == list(range(20))
+
+    results = parallel.imap(Flaky(failures=1), range(5), retries=1)
+    assert list(results) == [(i, i) for i in range(5)]
+
+
+def test_par_and_decorator_retries():
+    fn = Flaky(failures=1)
+    results = parallel.par({'a': (fn, 1), 'b': (fn, 2)}, retries=1)
+    assert results == {'a': 1, 'b': 2}
+
+    decorated = parallel.decorate(retries=1)(Flaky(failures=1))
+    assert decorated.map([1, 2]) == [1, 2]
+
+
+def test_decorator_retries_can_be_turned_off():
+    decorated = parallel.decorate(retries=2, backoff=1)(Flaky(failures=1))
+    results = decorated.map([1, 2], retries=0, silent=True)
+    assert len(results.failed) == 2
+
+    decorated = parallel.decorate(retries=1, retry_on=(ValueError,))(Flaky(failures=1))
+    assert decorated.map([1], retry_on=(TestingException,)) == [1]
@@ -1,3 +1,7 @@
+import pickle
+
+import pytest
+
 from parallel.models import ParallelJob, ParallelArg
 from unittest.mock import MagicMock
 
@@ -284,4 +288,20 @@ def test_all_named_params_without_sequence_unpack_args_false():
         'a': {'p1': 1, 'p2': 2},
         'b': {'p1': 3, 'p2': 4},
     }, unpack_arguments=False)
-    assert args == expected
\ No newline at end of file
+    assert args == expected
+
+def test_shared_kwargs_are_read_only():
+    extras = {'p1': 1}
+    first, second = ParallelJob.build_for_callable_from_params(mocked_fn, [1, 2], extras=extras)
+    assert first.kwargs is second.kwargs
+    assert ParallelJob(mocked_fn).kwargs is ParallelJob(mocked_fn).kwargs
+    for kwargs in [first.kwargs, ParallelJob(mocked_fn).kwargs]:
+        with pytest.raises(TypeError):
+            kwargs['p2'] = 2
+        with pytest.raises(TypeError):
+            kwargs.update(p2=2)
+    # Copies are regular dicts
+    copied = pickle.loads(pickle.dumps(first.kwargs))
+    copied['p2'] = 2
+    assert type(copied) is dict
+    assert first.kwargs == extras == {'p1': 1}
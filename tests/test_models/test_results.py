@@ -0,0 +1,140 @@
+import array
+import math
+
+import pytest
+
+import parallel
+from parallel.models import (
+    FailedTask,
+    SequentialMapResult,
+    NamedMapResult,
+    ColumnarMapResult,
+)
+
+
+def failed_task(exc=None):
+    return FailedTask(None, exc or ValueError('failed'))
+
+
+def test_sequential_result_tracks_failures():
+    results = SequentialMapResult()
+    assert results.failures is False
+    ft1, ft2 = failed_task(), failed_task()
+    for value in [1, ft1, 3, ft2]:
+        results.new_result(None, value)
+
+    assert results.failures is True
+    assert results.failed == [ft1, ft2]
+    assert results.succeeded == [1, 3]
+    assert results.replace_failed(None) == [1, None, 3, None]
+
+    # Built from a list
+    results = SequentialMapResult([ft1, 2])
+    assert results.failed == [ft1]
+    assert results.succeeded == [2]
+
+
+def test_named_result_tracks_failures():
+    results = NamedMapResult()
+    ft = failed_task()
+    results.new_result('a', 1)
+    results.new_result('b', ft)
+    assert results.failures is True
+    assert results.failed == {'b': ft}
+    assert results.succeeded == {'a': 1}
+    assert results.replace_failed(0) == {'a': 1, 'b': 0}
+
+
+def test_results_modified_after_built():
+    ft1, ft2 = failed_task(), failed_task()
+    results = SequentialMapResult([1, ft1, 3])
+    results[1] = 2
+    assert results.failures is False
+    results.append(ft2)
+    results.extend([ft1])
+    assert results.failed == [ft2, ft1]
+    del results[0]
+    results.pop()
+    assert results.failed == [ft2]
+    assert results.succeeded == [2, 3]
+    results.new_result(None, ft1)
+    assert results.replace_failed(0) == [2, 3, 0, 0]
+
+    results = NamedMapResult({'a': ft1, 'b': 2})
+    results['a'] = 1
+    results['c'] = ft2
+    assert results.failed == {'c': ft2}
+    del results['c']
+    assert results.failures is False
+    results.update(d=ft1)
+    results.new_result('b', ft2)
+    assert results.failed == {'d': ft1, 'b': ft2}
+    assert results.succeeded == {'a': 1}
+
+
+def test_columnar_result():
+    results = ColumnarMapResult('d')
+    ft = failed_task()
+    for value in [1.5, ft, 3]:
+        results.new_result(None, value)
+
+    assert len(results) == 3
+    assert results[0] == 1.5
+    assert results[1] is ft
+    assert results[-1] == 3.0
+    assert results[:2] == [1.5, ft]
+    assert results == [1.5, ft, 3.0]
+    assert results.failures is True
+    assert results.failed == [ft]
+    assert results.failed_indexes == [1]
+    assert results.succeeded == array.array('d', [1.5, 3.0])
+    assert results.replace_failed(0) == array.array('d', [1.5, 0, 3.0])
+    assert math.isnan(results.values[1])
+
+
+def test_map_with_dtype():
+    results = parallel.map(lambda x: x * 2, range(10), dtype='q')
+    assert isinstance(results, ColumnarMapResult)
+    assert results.values == array.array('q', range(0, 20, 2))
+    assert results.failures is False
+    assert list(results) == list(range(0, 20, 2))
+
+
+def test_map_with_dtype_failures():
+    def halve(x):
+        if x == 3:
+            raise ValueError('three')
+        return x / 2
+
+    results = parallel.map(halve, range(5), dtype='d', silent=True)
+    assert results.failed_indexes == [3]
+    assert isinstance(results[3], FailedTask)
+    assert results.succeeded == array.array('d', [0, 0.5, 1, 2])
+
+
+def test_map_dtype_requires_sequence():
+    with pytest.raises(ValueError):
+        parallel.map(lambda x: x, {'a': 1}, dtype='d')
+
+
+def test_columnar_to_numpy():
+    np = pytest.importorskip('numpy')
+    results = parallel.map(lambda x: x + 1, range(4), dtype='float64')
+    assert results.values.typecode == 'd'
+    array_ = results.to_numpy()
+    assert array_.dtype == np.float64
+    assert array_.tolist() == [1, 2, 3, 4]
+
+
+def test_columnar_to_arrow():
+    pa = pytest.importorskip('pyarrow')
+
+    def check(x):
+        if x == 1:
+            raise ValueError('one')
+        return x
+
+    results = parallel.map(check, range(3), dtype='q', silent=True)
+    arrow = results.to_arrow()
+    assert arrow.type == pa.int64()
+    assert arrow.to_pylist() == [0, None, 2]
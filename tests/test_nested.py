@@ -0,0 +1,77 @@
+import os
+import sys
+import threading
+
+import pytest
+
+import parallel
+from parallel import utils, worker
+
+from .base import *
+
+
+@pytest.fixture
+def budget_of_8():
+    parallel.set_concurrency_budget(8)
+    try:
+        yield
+    finally:
+        parallel.set_concurrency_budget(None)
+
+
+def omp_threads(_):
+    return worker.budget(), os.environ.get('OMP_NUM_THREADS')
+
+
+def test_budget_outside_of_jobs():
+    assert worker.budget() is None
+
+
+def test_nested_map_limited_to_share(budget_of_8):
+    threads = {}
+    lock = threading.Lock()
+
+    def inner(x):
+        with lock:
+            threads.setdefault(x // 10, set()).add(threading.current_thread().name)
+        return worker.budget()
+
+    def outer(x):
+        budget = worker.budget()
+        inner_budgets = parallel.map(inner, range(x * 10, x * 10 + 10))
+        return budget, utils.default_max_workers(), set(inner_budgets)
+
+    results = parallel.map(outer, range(4), max_workers=4)
+    # 8 workers shared by the 4 outer jobs, the inner ones get 1
+    assert results == [(2, 2, {1})] * 4
+    assert all(len(names) <= 2 for names in threads.values())
+
+
+def test_nested_split_limited_to_share(budget_of_8):
+    def outer(x):
+        return len(parallel.split(list(range(100)), lambda part: [len(part)]))
+
+    # Each of the 2 outer jobs splits in its 4 workers
+    assert parallel.map(outer, range(2), max_workers=2) == [4, 4]
+
+
+def test_explicit_max_workers_nested(budget_of_8):
+    def outer(x):
+        return len(parallel.split(list(range(100)), lambda part: [len(part)], workers=5))
+
+    assert parallel.map(outer, range(2), max_workers=2) == [5, 5]
+
+
+@pytest.mark.skipif('OMP_NUM_THREADS' in os.environ, reason='Already capped')
+def test_process_workers_cap_blas_threads(budget_of_8):
+    results = parallel.map(omp_threads, range(4), executor=parallel.PROCESS_EXECUTOR, max_workers=2)
+    assert results == [(4, '4')] * 4
+
+
+@pytest.mark.skipif('OMP_NUM_THREADS' in os.environ, reason='Already capped')
+def test_process_workers_cap_blas_threads_without_initializer(budget_of_8, monkeypatch):
+    # Python 3.6 pools have no initializers, workers cap their threads on
+    # their first call
+    monkeypatch.setattr(sys, 'version_info', (3, 6, 15))
+    results = parallel.map(omp_threads, range(4), executor=parallel.PROCESS_EXECUTOR, max_workers=2)
+    assert results == [(4, '4')] * 4
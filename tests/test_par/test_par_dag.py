@@ -0,0 +1,100 @@
+import time
+import threading
+
+import pytest
+
+import parallel
+from parallel.exceptions import DependencyException
+from parallel.models import FailedTask, NamedMapResult
+
+from ..base import *
+
+
+def add(*values):
+    return sum(values)
+
+
+def fail(*values):
+    raise ValueError('failed')
+
+
+def test_par_dag_named():
+    a = parallel.job(add, 1, 2)
+    b = parallel.job(add, 10)
+    c = parallel.job(add, a, b)
+    d = parallel.job(lambda c, offset: c + offset, c, offset=a)
+    results = parallel.par({'a': a, 'b': b, 'c': c, 'd': d}, dag=True)
+    assert isinstance(results, NamedMapResult)
+    assert results == {'a': 3, 'b': 10, 'c': 13, 'd': 16}
+
+
+def test_par_dag_sequence():
+    a = parallel.job(add, 1)
+    b = parallel.job(add, a, a)
+    assert parallel.par([b, a], dag=True) == [2, 1]
+
+
+def test_par_dag_submits_when_dependencies_resolve():
+    events = []
+    lock = threading.Lock()
+
+    def step(name, delay, *dependencies):
+        with lock:
+            events.append(('start', name))
+        time.sleep(delay)
+        with lock:
+            events.append(('end', name))
+        return name
+
+    fast = parallel.job(step, 'fast', 0)
+    slow = parallel.job(step, 'slow', .3)
+    after_fast = parallel.job(step, 'after_fast', 0, fast)
+    results = parallel.par({'fast': fast, 'slow': slow, 'after_fast': after_fast}, dag=True)
+    assert results['after_fast'] == 'after_fast'
+    # It didn't wait for the whole "stage" (the slow job)
+    assert events.index(('end', 'after_fast')) < events.index(('end', 'slow'))
+    assert events.index(('start', 'after_fast')) > events.index(('end', 'fast'))
+
+
+def test_par_dag_failures_propagate():
+    a = parallel.job(fail)
+    b = parallel.job(add, a)
+    c = parallel.job(add, b, 1)
+    d = parallel.job(add, 5)
+    results = parallel.par({'a': a, 'b': b, 'c': c, 'd': d}, dag=True, silent=True)
+    assert results['d'] == 5
+    assert isinstance(results['a'], FailedTask)
+    exc = results['b'].exc
+    assert isinstance(exc, DependencyException)
+    assert exc.key == 'a' and isinstance(exc.exc, ValueError)
+    assert results['c'].exc.key == 'b'
+
+    with pytest.raises(ValueError):
+        parallel.par({'a': a, 'b': b}, dag=True)
+
+
+def test_par_dag_process_executor():
+    a = parallel.job(add, 1, 2)
+    b = parallel.job(add, a, 4)
+    results = parallel.par({'a': a, 'b': b}, dag=True, executor=parallel.PROCESS_EXECUTOR)
+    assert results == {'a': 3, 'b': 7}
+
+
+def test_par_dag_deadline():
+    a = parallel.job(time.sleep, 1)
+    b = parallel.job(add, a)
+    results = parallel.par({'a': a, 'b': b}, dag=True, deadline=.1, silent=True)
+    assert isinstance(results['a'].exc, parallel.exceptions.TimeoutException)
+    assert isinstance(results['b'].exc, DependencyException)
+
+
+def test_par_dag_invalid_graphs():
+    outside = parallel.job(add, 1)
+    with pytest.raises(ValueError):
+        parallel.par({'a': parallel.job(add, outside)}, dag=True)
+
+    a = parallel.job(add, 1)
+    b = parallel.job(add, a)
+    a.args = [b]
+    with pytest.raises(ValueError):
+        parallel.par({'a': a, 'b': b}, dag=True)
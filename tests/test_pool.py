@@ -0,0 +1,71 @@
+import pytest
+
+import parallel
+from parallel import exceptions
+
+from .base import *
+
+
+def process_records_simple(records):
+    return [r ** 2 for r in records]
+
+
+def test_pool_map_par_split():
+    with parallel.Pool(max_workers=2) as pool:
+        results = pool.map(sleep_return_multi_param, [(.1, 'a'), (.1, 'b')])
+        assert results == ['a', 'b']
+
+        results = pool.par({
+            'r1': parallel.job(sleep_return_multi_param, .1, 'a'),
+            'r2': parallel.job(sleep_return_multi_param, .1, 'b'),
+        })
+        assert results == {'r1': 'a', 'r2': 'b'}
+
+        results = pool.split([1, 2, 3, 4], process_records_simple)
+        assert results == [1, 4, 9, 16]
+
+        with pool.async_map(sleep_return_single_param, [.1, .2]) as ex:
+            assert ex.results() == ['0.1', '0.2']
+
+
+def test_pool_workers_are_reused():
+    pool = parallel.Pool(max_workers=2)
+    assert pool.started is False
+
+    pool.map(sleep_return_single_param, [.1, .1])
+    executor = pool.get_executor()
+    pool.map(sleep_return_single_param, [.1, .1])
+    assert pool.get_executor() is executor
+
+    pool.shutdown()
+    assert pool.closed is True
+
+
+def test_pool_process_executor():
+    with parallel.Pool(parallel.PROCESS_EXECUTOR, max_workers=2) as pool:
+        assert pool.map(sleep_return_multi_param, [(.1, 'a'), (.1, 'b')]) == ['a', 'b']
+        assert pool.map(sleep_return_multi_param, [(.1, 'c')]) == ['c']
+
+
+def test_pool_closed_raises_exception():
+    pool = parallel.Pool()
+    pool.shutdown()
+    with pytest.raises(exceptions.ParallelStatusException):
+        pool.map(sleep_return_single_param, [.1])
+
+
+def test_helper_bound_to_pool():
+    with parallel.Pool(max_workers=2) as pool:
+        helper = parallel.ParallelHelper(pool=pool)
+        assert helper.map(sleep_return_single_param, [.1, .2]) == ['0.1', '0.2']
+        assert pool.started is True
+
+
+def test_decorator_bound_to_pool():
+    with parallel.Pool(max_workers=2) as pool:
+        decorated = parallel.decorate(sleep_return_multi_param, pool=pool)
+        assert decorated.map([(.1, 'a'), (.1, 'b')]) == ['a', 'b']
+
+        decorated = pool.decorate(max_workers=1)(sleep_return_multi_param)
+        assert decorated.map([(.1, 'a'), (.1, 'b')]) == ['a', 'b']
+        assert decorated.thread.map([(.1, 'c')]) == ['c']
@@ -0,0 +1,72 @@
+import io
+import pstats
+import contextlib
+
+import pytest
+
+import parallel
+from parallel.profiling import ProfileReport
+
+from .base import *
+
+
+def busy(iterations):
+    return sum(i * i for i in range(iterations))
+
+
+def sum_records(records):
+    return [busy(record) for record in records]
+
+
+def profiled_functions(report):
+    return {function for _, _, function in report.stats.stats}
+
+
+@pytest.mark.parametrize('executor', [parallel.THREAD_EXECUTOR, parallel.PROCESS_EXECUTOR])
+def test_map_profile(executor):
+    results = parallel.map(busy, [10000] * 4, executor=executor, profile=True, max_workers=2)
+    assert results == [busy(10000)] * 4
+
+    report = results.profile
+    assert report.calls == 4
+    assert 'busy' in profiled_functions(report)
+    assert report.user_time > 0
+    assert set(report.breakdown) == {'user', 'library', 'dispatch', 'return'}
+    assert all(value >= 0 for value in report.breakdown.values())
+
+
+def test_map_profile_chunks_and_par():
+    results = parallel.process.map(busy, [1000] * 6, chunksize=3, profile=True)
+    assert results.profile.calls == 2
+    assert 'run_registered_chunk' in profiled_functions(results.profile)
+
+    results = parallel.par({
+        'a': (busy, 100),
+        'b': (sleep_return_single_param, .1),
+    }, profile=True)
+    assert {'busy', 'sleep_return_single_param'} <= profiled_functions(results.profile)
+    assert results.profile.user_time >= .1
+
+
+def test_map_without_profile():
+    assert parallel.map(busy, [10]).profile is None
+
+
+def test_split_profile(tmp_path):
+    results = parallel.split([100] * 10, sum_records, workers=2, profile=True)
+    assert results == [busy(100)] * 10
+    assert results.profile.calls == 2
+
+    report = ProfileReport()
+    parallel.split([100] * 10, sum_records, workers=2, profile=report)
+    parallel.map(busy, [100], profile=report)
+    assert report.calls == 3
+
+    path = str(tmp_path / 'profile.out')
+    report.dump_stats(path)
+    assert pstats.Stats(path).total_calls == report.stats.total_calls
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        report.print_stats(5)
+    assert output.getvalue().startswith('3 calls: user')
@@ -0,0 +1,73 @@
+import io
+import time
+
+import pytest
+
+import parallel
+from parallel.progress import Progress, ProgressReport, print_progress
+
+from .base import *
+
+
+@pytest.mark.parametrize('executor', [parallel.THREAD_EXECUTOR, parallel.PROCESS_EXECUTOR])
+def test_map_progress_callback(executor):
+    reports = []
+    results = parallel.map(
+        sleep_return_single_param, [.1, .2, 'Will Fail'],
+        executor=executor, silent=True, progress=reports.append)
+    assert results[:2] == ['0.1', '0.2']
+
+    last = reports[-1]
+    assert (last.completed, last.failed, last.total) == (3, 1, 3)
+    assert last.finished and last.eta == 0
+    assert all(report.completed <= 3 for report in reports)
+
+
+def test_progress_is_rate_limited():
+    reports = []
+    parallel.map(
+        sleep_return_single_param, [0] * 200, max_workers=4,
+        progress=Progress(reports.append, interval=10))
+    # The first report and the final one
+    assert [report.completed for report in reports] == [1, 200]
+
+
+def test_progress_is_reported_before_results_are_consumed():
+    reports = []
+    ex = parallel.async_map(sleep_return_single_param, [.1, .1], progress=reports.append)
+    with ex:
+        time.sleep(.3)
+        assert reports[-1].completed == 2
+        assert ex.results() == ['0.1', '0.1']
+
+
+def test_progress_par_and_split():
+    reports = []
+    parallel.par({
+        'a': (sleep_return_single_param, .1),
+        'b': (sleep_return_single_param, .1),
+    }, progress=reports.append)
+    assert reports[-1].completed == 2
+
+    reports = []
+    parallel.split(list(range(10)), sorted, chunks=5, progress=reports.append)
+    assert reports[-1].completed == reports[-1].total == 5
+
+
+def test_progress_retries_and_failures():
+    reports = []
+    with pytest.raises(TypeError):
+        parallel.map(
+            sleep_return_single_param, ['Will Fail'], retries=2, progress=reports.append)
+    # Retried attempts aren't reported as failed
+    assert [(r.completed, r.failed) for r in reports] == [(1, 1)]
+
+
+def test_print_progress():
+    output = io.StringIO()
+    print_progress(ProgressReport(5, 1, 10, 2.5, False), file=output)
+    print_progress(ProgressReport(7, 1, None, 0, True), file=output)
+    assert output.getvalue() == (
+        '\r5/10 (1 failed) 2.0 jobs/s, ETA 2s'
+        '\r7/? (1 failed) ? jobs/s, ETA ?\n'
+    )
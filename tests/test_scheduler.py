@@ -0,0 +1,84 @@
+import threading
+from unittest.mock import MagicMock
+
+import parallel
+from parallel.models import ParallelJob
+
+from .base import *
+from .test_map.test_map_chunksize import ChunkRecordingExecutor
+
+
+def square(value):
+    return value ** 2
+
+
+def process_records_simple(records):
+    return [r ** 2 for r in records]
+
+
+def test_guided_scheduler_map():
+    helper = parallel.ParallelHelper(scheduler='guided')
+    assert helper.map(square, range(50), max_workers=4) == [r ** 2 for r in range(50)]
+
+    helper = parallel.ParallelHelper(parallel.PROCESS_EXECUTOR, scheduler=parallel.GUIDED_SCHEDULER)
+    assert helper.map(square, {'a': 2, 'b': 3}, max_workers=2) == {'a': 4, 'b': 9}
+
+
+def test_guided_scheduler_chunks_shrink():
+    mocked_fn = MagicMock(return_value=None)
+    jobs = [ParallelJob(mocked_fn, args=(i, )) for i in range(20)]
+
+    with ChunkRecordingExecutor(jobs, max_workers=4, scheduler='guided') as ex:
+        assert ex.results() == [None] * 20
+
+    assert [len(chunk) for chunk in ex.chunks] == [5, 4, 3, 2, 2, 1, 1, 1, 1]
+
+
+def test_guided_scheduler_split():
+    helper = parallel.ParallelHelper(scheduler='guided')
+    results = helper.split(list(range(20)), process_records_simple, workers=4)
+    assert results == [r ** 2 for r in range(20)]
+
+
+def test_cost_dispatches_expensive_jobs_first():
+    started = []
+    lock = threading.Lock()
+
+    def record(value):
+        with lock:
+            started.append(value)
+        return value
+
+    helper = parallel.ParallelHelper(cost=lambda value: value)
+    results = helper.map(record, [1, 5, 3, 4, 2], max_workers=1)
+    assert results == [1, 5, 3, 4, 2]
+    assert started == [5, 4, 3, 2, 1]
+
+
+def test_cost_split_and_pool():
+    helper = parallel.ParallelHelper(cost=lambda record: record)
+    results = helper.split([1, 2, 3, 4, 5, 6], process_records_simple, workers=1, chunks=3)
+    assert results == [1, 4, 9, 16, 25, 36]
+
+    with parallel.Pool(max_workers=2, scheduler='guided', cost=len) as pool:
+        assert pool.map(len, ['aaa', 'b', 'cc']) == [3, 1, 2]
+
+
+def test_cost_split_sums_its_items():
+    started = []
+
+    def record_part(records):
+        started.append(list(records))
+        return records
+
+    # `cost` gets each item, parts are sorted by their total
+    helper = parallel.ParallelHelper(cost=lambda record: record)
+    results = helper.split([1, 1, 1, 10, 10, 10], record_part, workers=1, chunks=3)
+    assert results == [1, 1, 1, 10, 10, 10]
+    assert started == [[10, 10], [1, 10], [1, 1]]
+
+
+def test_cost_with_ordered_results_and_window():
+    helper = parallel.ParallelHelper(cost=lambda x: x)
+    results = helper.imap(lambda x: x, list(range(6)), max_in_flight=2)
+    assert list(results) == list(enumerate(range(6)))
@@ -0,0 +1,55 @@
+import pytest
+
+import parallel
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('multiprocessing.shared_memory')
+
+
+def square(records):
+    return records ** 2
+
+
+def total(records):
+    return np.array([records.sum()])
+
+
+def scale(records, factor=1):
+    return records * factor
+
+
+def test_split_shared_memory_writes_results_in_place():
+    records = np.arange(10, dtype='int64')
+    results = parallel.process.split(records, square, workers=3, transport='shared_memory')
+    assert isinstance(results, np.ndarray)
+    assert results.tolist() == [r ** 2 for r in range(10)]
+
+
+def test_split_shared_memory_multidimensional_and_extras():
+    records = np.arange(12, dtype='float64').reshape(6, 2)
+    results = parallel.split(
+        records, scale, executor=parallel.PROCESS_EXECUTOR, workers=2,
+        extras={'factor': 2}, transport='shared_memory')
+    assert results.tolist() == (records * 2).tolist()
+
+
+def test_split_shared_memory_results_with_other_shapes():
+    records = np.arange(10, dtype='int64')
+    results = parallel.process.split(records, total, chunks=2, transport='shared_memory')
+    assert results.tolist() == [10, 35]
+
+
+def test_split_shared_memory_thread_executor_uses_views():
+    records = np.arange(10, dtype='int64')
+    results = parallel.thread.split(records, square, workers=3, transport='shared_memory')
+    assert results.tolist() == [r ** 2 for r in range(10)]
+
+
+def square_in_place(records):
+    records **= 2
+
+
+def test_split_shared_memory_requires_a_result():
+    records = np.arange(10, dtype='int64')
+    with pytest.raises(TypeError):
+        parallel.process.split(records, square_in_place, workers=2, transport='shared_memory')
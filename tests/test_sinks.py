@@ -0,0 +1,131 @@
+import json
+import time
+import threading
+
+import pytest
+
+import parallel
+from parallel import sinks
+from parallel.models import FailedTask, SinkResult
+
+from .base import *
+
+
+def double(x):
+    if x == 3:
+        raise ValueError('three')
+    return x * 2
+
+
+def test_map_callable_sink():
+    written = []
+    results = parallel.map(lambda x: x * 2, range(10), sink=lambda key, result: written.append((key, result)))
+    assert isinstance(results, SinkResult)
+    assert results.written == 10
+    assert results.failures is False
+    assert sorted(written) == [(i, i * 2) for i in range(10)]
+
+
+def test_map_sink_failures_silent():
+    written = {}
+    results = parallel.map(double, range(5), silent=True, sink=written.__setitem__)
+    assert results.failed_count == 1
+    assert results.failures is True
+    assert isinstance(written[3], FailedTask)
+    assert written[4] == 8
+    assert results.failed == {3: written[3]}
+    with pytest.raises(TypeError):
+        results.succeeded
+    with pytest.raises(TypeError):
+        results.replace_failed(None)
+
+
+def test_sink_doesnt_keep_records():
+    jobs = [parallel.models.ParallelJob(double, args=(x, )) for x in range(3)]
+    with parallel.ThreadExecutor(jobs, sink=lambda key, result: None, stats=True) as ex:
+        results = ex.results()
+    assert results.written == 3
+    assert ex.stats is None
+
+
+def test_map_sink_fail_fast_closes_sink(tmp_path):
+    path = tmp_path / 'results.jsonl'
+    with pytest.raises(ValueError):
+        parallel.map(double, range(5), sink=str(path), max_workers=1)
+    # What completed before the failure was written
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert {'key': 0, 'result': 0} in lines
+
+
+def test_jsonl_sink(tmp_path):
+    path = tmp_path / 'results.jsonl'
+    parallel.map(double, range(5), silent=True, sink=path)
+    records = sorted(
+        (json.loads(line) for line in path.read_text().splitlines()),
+        key=lambda record: record['key'],
+    )
+    assert records[0] == {'key': 0, 'result': 0}
+    assert records[3] == {'key': 3, 'error': "ValueError('three')"}
+    assert len(records) == 5
+
+
+def test_pickle_sink_named(tmp_path):
+    path = tmp_path / 'results.pkl'
+    parallel.par({
+        'a': (double, 1),
+        'b': (double, 3),
+    }, silent=True, sink=path)
+    records = {key: (succeeded, value) for key, succeeded, value in sinks.PickleSink.load(path)}
+    assert records['a'] == (True, 2)
+    succeeded, exc = records['b']
+    assert succeeded is False
+    assert isinstance(exc, ValueError)
+
+
+def test_parquet_sink(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    path = tmp_path / 'results.parquet'
+    parallel.map(double, range(10), silent=True, sink=sinks.ParquetSink(path, batch_size=3))
+    table = pq.read_table(path).to_pydict()
+    rows = sorted(zip(table['key'], table['result'], table['error']))
+    assert rows[0] == (0, 0, None)
+    assert rows[3] == (3, None, "ValueError('three')")
+    assert len(rows) == 10
+
+
+def test_split_sink():
+    written = {}
+    results = parallel.split(list(range(10)), sum, chunks=3, sink=written.__setitem__)
+    assert results.written == 3
+    assert sum(written.values()) == 45
+
+
+def test_sink_backpressure():
+    # A slow sink keeps the submission within the in-flight window
+    lock = threading.Lock()
+    submitted = []
+
+    def identity(x):
+        with lock:
+            submitted.append(x)
+        return x
+
+    def slow_sink(key, result):
+        time.sleep(0.01)
+        with lock:
+            assert len(submitted) - written[0] <= 4
+        written[0] += 1
+
+    written = [0]
+    results = parallel.map(identity, iter(range(30)), max_workers=2, sink=slow_sink)
+    assert results.written == 30
+
+
+def test_get_sink():
+    assert isinstance(sinks.get_sink('out.jsonl'), sinks.JSONLinesSink)
+    assert isinstance(sinks.get_sink('out.pickle'), sinks.PickleSink)
+    assert isinstance(sinks.get_sink(print), sinks.CallableSink)
+    with pytest.raises(ValueError):
+        sinks.get_sink('out.csv')
+    with pytest.raises(TypeError):
+        sinks.get_sink(3)
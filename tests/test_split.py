@@ -55,4 +55,40 @@ def test_split_simple_extras():
 
     records = [1, 2, 3, 4, 5]
     results = parallel.split(records, process_records_extras, workers=2, extras={'double': True})
-    assert results == [2, 4, 6, 8, 10]
\ No newline at end of file
+    assert results == [2, 4, 6, 8, 10]
+
+def process_records_lengths(records):
+    return [len(r) for r in records]
+
+
+def test_split_more_chunks_than_workers():
+    records = list(range(1, 11))
+    results = parallel.split(records, process_records_simple, workers=2, chunks=5)
+    assert results == [r ** 2 for r in records]
+
+
+def test_split_round_robin():
+    records = list(range(1, 8))
+    results = parallel.split(records, process_records_simple, workers=3, strategy='round_robin')
+    assert results == [r ** 2 for r in records]
+
+
+def test_split_size_weighted():
+    records = ['a' * 10, 'b', 'c', 'd' * 5, 'e', 'f' * 3]
+    results = parallel.split(records, process_records_lengths, workers=3, strategy='size_weighted')
+    assert results == [10, 1, 1, 5, 1, 3]
+
+
+def test_split_range_and_generators():
+    results = parallel.split(range(1, 6), process_records_simple, workers=2)
+    assert results == [1, 4, 9, 16, 25]
+
+    results = parallel.split((r for r in range(1, 6)), process_records_simple, chunk_size=2)
+    assert results == [1, 4, 9, 16, 25]
+
+
+def test_split_executor_argument():
+    records = [1, 2, 3, 4]
+    results = parallel.thread.split(
+        records, process_records_simple, executor=parallel.PROCESS_EXECUTOR, workers=2)
+    assert results == [1, 4, 9, 16]
@@ -0,0 +1,74 @@
+import parallel
+from parallel import ThreadExecutor
+from parallel.models import ParallelJob
+from parallel.stats import ExecutionStats, JobRecord, percentile
+
+from .base import *
+
+
+def test_map_results_have_stats():
+    results = parallel.map(sleep_return_single_param, [.1, .1, .1, .5], max_workers=4, stats=True)
+    assert results == ['0.1', '0.1', '0.1', '0.5']
+
+    stats = results.stats
+    assert stats.jobs == 4
+    assert .5 <= stats.wall_time < 1
+    assert .5 <= stats.run_time['max'] < .7
+    assert stats.run_time['p50'] < .2
+    assert stats.queue_wait['max'] < .1
+    assert 4 < stats.throughput < 8
+    assert len(stats.busy_time) == 4
+    assert [record.key for record in stats.stragglers] == [3]
+
+
+def test_named_results_and_failures_have_stats():
+    results = parallel.par({
+        'a': (sleep_return_single_param, .1),
+        'b': (sleep_return_single_param, 'Will Fail'),
+    }, silent=True, stats=True)
+    assert {record.key for record in results.stats.records} == {'a', 'b'}
+    failed = results.failed['b'].job
+    assert failed.started_at <= failed.finished_at
+    assert failed.worker is not None
+
+
+def test_job_timing_is_recorded():
+    jobs = [ParallelJob(sleep_return_single_param, args=(.2, )) for _ in range(2)]
+    with ThreadExecutor(jobs, max_workers=1, stats=True) as ex:
+        ex.results()
+    first, second = jobs
+    # The second job waited in the queue while the first one was running
+    assert second.started_at - second.submitted_at >= .2
+    assert first.worker == second.worker
+    assert ex.stats.utilization > .9
+
+
+def test_chunks_time_each_job():
+    results = parallel.process.map(
+        sleep_return_single_param, [.1, .3, .1], chunksize=3, max_workers=1, stats=True)
+    run_times = [record.run_time for record in results.stats.records]
+    assert .3 <= max(run_times) < .4
+    assert len([t for t in run_times if t < .2]) == 2
+    assert len({record.worker for record in results.stats.records}) == 1
+
+
+def test_stats_are_opt_in():
+    results = parallel.map(sleep_return_single_param, [.1, .1])
+    assert results == ['0.1', '0.1']
+    assert results.stats is None
+
+
+def test_execution_stats():
+    records = [
+        JobRecord(i, 0, 0, run_time, 'w{}'.format(i % 2))
+        for i, run_time in enumerate([1, 1, 1, 4])
+    ]
+    stats = ExecutionStats(records, started=0, finished=4, workers=2)
+    assert stats.run_time == {'mean': 1.75, 'p50': 1, 'p90': 4, 'p99': 4, 'max': 4}
+    assert stats.busy_time == {'w0': 2, 'w1': 5}
+    assert stats.utilization == 7 / 8
+    assert stats.throughput == 1
+    assert stats.stragglers == [records[3]]
+
+    assert percentile([], 50) is None
+    assert ExecutionStats([], started=0, finished=0).utilization is None
@@ -1,4 +1,6 @@
-from parallel.utils import split_collection
+import pytest
+
+from parallel.utils import split_collection, merge_chunks, auto_chunksize
 
 def test_split_collection():
     records = [1, 2, 3, 4]
@@ -31,4 +33,65 @@ def test_split_collection():
 
     records = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11]
     parts = split_collection(records, 3)
-    assert list(parts) == [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11]]
\ No newline at end of file
+    assert list(parts) == [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11]]
+
+def test_auto_chunksize():
+    assert auto_chunksize(list(range(100)), 4) == 7
+    assert auto_chunksize(list(range(3)), 4) == 1
+    assert auto_chunksize(iter(range(100)), 4) == 1
+
+
+def test_split_collection_no_empty_chunks():
+    parts = split_collection([1, 2, 3, 4, 5], 4)
+    assert list(parts) == [[1, 2], [3], [4], [5]]
+
+    parts = split_collection([1, 2], 4)
+    assert list(parts) == [[1], [2]]
+
+    assert list(split_collection([], 4)) == []
+
+
+def test_split_collection_any_sliceable():
+    assert list(split_collection(range(5), 2)) == [range(0, 3), range(3, 5)]
+    assert list(split_collection((1, 2, 3), 2)) == [(1, 2), (3, )]
+
+    view = memoryview(b'abcde')
+    assert [bytes(part) for part in split_collection(view, 2)] == [b'abc', b'de']
+
+    parts = split_collection((r for r in range(5)), chunk_size=2)
+    assert list(parts) == [[0, 1], [2, 3], [4]]
+
+    with pytest.raises(ValueError):
+        list(split_collection({'a': 1}, 2))
+
+
+def test_split_collection_strategies():
+    records = list(range(7))
+    parts = split_collection(records, 3, strategy='round_robin')
+    assert list(parts) == [[0, 3, 6], [1, 4], [2, 5]]
+
+    parts = split_collection(['aaaa', 'b', 'c', 'dd', 'e', 'f'], 3, strategy='size_weighted')
+    assert list(parts) == [['aaaa'], ['b', 'c', 'dd'], ['e', 'f']]
+
+    parts = split_collection([1, 2, 3, 4], 2, strategy='size_weighted', weight=lambda r: r)
+    assert list(parts) == [[1, 2, 3], [4]]
+
+    with pytest.raises(ValueError):
+        list(split_collection(records, 3, strategy='random'))
+
+
+def test_merge_chunks():
+    assert merge_chunks([[1, 2], [3]]) == [1, 2, 3]
+    assert merge_chunks([[0, 3, 6], [1, 4], [2, 5]], strategy='round_robin') == list(range(7))
+    assert merge_chunks([]) == []
+
+
+def test_merge_chunks_numpy():
+    np = pytest.importorskip('numpy')
+    parts = list(split_collection(np.arange(7), 3, strategy='round_robin'))
+    merged = merge_chunks(parts, strategy='round_robin')
+    assert isinstance(merged, np.ndarray)
+    assert merged.tolist() == list(range(7))
+
+    merged = merge_chunks(list(split_collection(np.arange(7), 3)))
+    assert merged.tolist() == list(range(7))